@@ -36,6 +36,25 @@ OVERCONFIDENT_PATTERNS = [
     r'\bfor certain\b',
 ]
 
+# Claim type taxonomy, checked in priority order; the entry without a pattern is the default
+CLAIM_TYPES = [
+    {
+        "label": "📊 Quantitative",
+        "description": "Contains numerical/measured data",
+        "pattern": r'\d+\.?\d*\s*(?:%|percent|degrees|meters|dollars|years|days|hours|kg|km|miles|pounds)',
+    },
+    {
+        "label": "🧠 Causal",
+        "description": "Describes cause-effect relationships",
+        "pattern": r'\b(?:because|since|leads?\s+to|causes?|results?\s+in|due\s+to|therefore|thus|consequently)\b',
+    },
+    {
+        "label": "📚 Factual",
+        "description": "States factual information",
+        "pattern": None,
+    },
+]
+
 # Evidence retrieval settings
 EVIDENCE_SETTINGS = {
     "top_k": 3,              # Number of evidence sources to retrieve
@@ -88,12 +107,19 @@ DOMAIN_CONFIG = {
     },
 }
 
-# API mock settings
+# API settings (served by proofsense_server.py)
 API_CONFIG = {
     "endpoint": "/api/verify",
     "method": "POST",
     "rate_limit": "100 requests/hour",
     "response_format": "JSON",
+    "host": "127.0.0.1",     # proofsense_server.py defaults
+    "port": 8000,
+    "workers": 8,            # Verification threads (when batching is off)
+    "queue_size": 256,       # Requests waiting (per domain when batching) before answering 503
+    "batch_window": 0.002,   # Seconds to coalesce concurrent requests into one batch (0 = off)
+    "max_batch": 64,         # Most requests verified in one batch
+    "max_batch_claims": 256, # Most claims in one batched retrieval pass
 }
 
 # Feature flags (for easy enable/disable)
@@ -111,6 +137,6 @@ FEATURES = {
 ADVANCED = {
     "use_cache": True,
     "max_processing_time": 30,  # seconds
-    "parallel_processing": False,  # For future multi-threading
+    "parallel_processing": False,  # Default to one worker per CPU (verify_batch processes, claim retrieval threads)
     "logging_level": "INFO",
 }
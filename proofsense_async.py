@@ -0,0 +1,48 @@
+"""
+ProofSense AI - Async Evidence Backends
+Protocol for evidence stores reached over I/O, plus an in-process stand-in
+
+ProofSenseEngine.averify_answer / aretrieve_evidence await the engine's
+``evidence_backend`` once per distinct claim, so the lookups of one answer
+(and of many answers verified together) overlap on one event loop. A
+backend only has to implement ``retrieve``; concurrency limits are applied
+by the engine.
+"""
+
+import asyncio
+from typing import List, Optional, Protocol, Tuple, runtime_checkable
+
+
+@runtime_checkable
+class AsyncEvidenceBackend(Protocol):
+    """Anything that can fetch ranked evidence for a claim without blocking the loop
+
+    ``name`` identifies the backend in claim-cache keys, so results from
+    different backends are never mixed up.
+    """
+
+    name: str
+
+    async def retrieve(self, claim: str, top_k: int, threshold: float) -> List[Tuple[str, float]]:
+        """(evidence text, score) pairs above threshold, best first"""
+        ...
+
+
+class LocalEvidenceBackend:
+    """Serves the engine's own in-memory index through the async protocol
+
+    Lookups run inline (they take microseconds); ``latency`` adds a
+    simulated round trip per lookup, to exercise overlapping I/O without a
+    network.
+    """
+
+    name = "local"
+
+    def __init__(self, engine, latency: Optional[float] = None):
+        self.engine = engine
+        self.latency = latency
+
+    async def retrieve(self, claim: str, top_k: int, threshold: float) -> List[Tuple[str, float]]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.engine.retrieve_evidence(claim, top_k, threshold)
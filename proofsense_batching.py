@@ -0,0 +1,101 @@
+"""
+ProofSense AI - Micro-Batching
+Coalesce concurrent verification requests into one batched engine pass
+
+A MicroBatcher sits in front of one engine (one domain). Requests queue up;
+its scheduler thread takes the first waiting request, keeps collecting for
+at most ``window`` seconds or until ``max_batch`` requests, then verifies
+them all with engine.verify_answers: one retrieval and scoring pass per
+``max_claims`` claims, with claims repeated across requests in a pass
+verified once. Bounding passes by claims rather than requests keeps a burst
+of long answers from building one oversized retrieval batch. Each caller's
+Future receives its own VerificationResult.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Tuple
+
+# Default collection window (seconds), batch size cap and claims per retrieval pass
+DEFAULT_WINDOW = 0.002
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_CLAIMS = 256
+
+
+class MicroBatcher:
+    """Scheduler that verifies concurrent requests for one engine in batches"""
+
+    def __init__(self, engine, window: float = DEFAULT_WINDOW, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_pending: int = 0, max_claims: int = DEFAULT_MAX_CLAIMS):
+        self.engine = engine
+        self.window = window
+        self.max_batch = max_batch
+        self.max_claims = max_claims
+        self.batches = 0
+        self.requests = 0
+
+        self._pending: "queue.Queue" = queue.Queue(max_pending)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="proofsense-batcher", daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        return self._pending.qsize()
+
+    def submit(self, answer: str) -> Future:
+        """Queue an answer for verification; raises queue.Full when ``max_pending`` are waiting"""
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        future = Future()
+        self._pending.put_nowait((future, answer))
+        return future
+
+    def verify(self, answer: str):
+        """Blocking helper: submit and wait for the result"""
+        return self.submit(answer).result()
+
+    def _collect(self) -> Tuple[List[Tuple[Future, str]], bool]:
+        """Next batch of requests, and whether the batcher was asked to stop"""
+        first = self._pending.get()
+        if first is None:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._pending.get(timeout=remaining) if remaining > 0 else self._pending.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = self._collect()
+            batch = [(future, answer) for future, answer in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            self.batches += 1
+            self.requests += len(batch)
+            try:
+                results = self.engine.verify_answers([answer for _, answer in batch], self.max_claims)
+            except BaseException as error:
+                for future, _ in batch:
+                    future.set_exception(error)
+                continue
+            for (future, _), result in zip(batch, results):
+                future.set_result(result)
+
+    def close(self) -> None:
+        """Finish requests already queued, then stop the scheduler thread"""
+        self._closed = True
+        self._pending.put(None)
+        self._thread.join()
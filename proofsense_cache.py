@@ -0,0 +1,141 @@
+"""
+ProofSense AI - Claim Cache
+Bounded LRU + TTL cache of verified claims, shared by engines of the same domain
+
+Keys combine the normalized claim text with a namespace naming the domain,
+knowledge-base version and scoring configuration, so a cached claim is only
+reused where re-verifying it would give the same result.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+# Fixed per-entry overhead (key tuple, dataclass, list objects) added to the text sizes
+ENTRY_OVERHEAD_BYTES = 512
+
+
+def normalize_claim(text: str) -> str:
+    """Case-insensitive form of a claim; retrieval and language checks both lowercase first"""
+    return text.strip().lower()
+
+
+def copy_claim(claim, text: Optional[str] = None):
+    """Independent copy of a claim, optionally re-labelled with another wording of the same text"""
+    return replace(claim, text=claim.text if text is None else text,
+                   evidence=list(claim.evidence), warnings=list(claim.warnings))
+
+
+def estimate_claim_bytes(claim) -> int:
+    """Approximate memory held by a cached claim"""
+    strings = [claim.text, claim.explanation, *claim.evidence, *claim.warnings]
+    return ENTRY_OVERHEAD_BYTES + sum(len(string) for string in strings)
+
+
+class ClaimCache:
+    """Thread-safe LRU cache of Claim results with a time-to-live and a memory cap
+
+    Entries are evicted least-recently-used first whenever ``max_entries`` or
+    ``max_bytes`` would be exceeded; entries older than ``ttl`` seconds are
+    dropped on access. Evidence texts are shared with the knowledge base, so
+    ``max_bytes`` is an upper-bound estimate rather than an exact measure.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024,
+                 ttl: Optional[float] = 3600.0, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+
+        self._entries: "OrderedDict[Tuple[Hashable, str], Tuple[object, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getstate__(self):
+        # Entries are per process: a pickled cache (e.g. sent to a worker) arrives empty
+        return {"max_entries": self.max_entries, "max_bytes": self.max_bytes, "ttl": self.ttl, "clock": self.clock}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _drop(self, key) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, namespace: Hashable, claim_text: str):
+        """Cached claim for this text, re-labelled with the caller's exact wording, or None"""
+        key = (namespace, normalize_claim(claim_text))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and self.clock() - entry[2] > self.ttl:
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return copy_claim(entry[0], claim_text)
+
+    def put(self, namespace: Hashable, claim) -> None:
+        """Store a verified claim, evicting least-recently-used entries to stay within bounds"""
+        key = (namespace, normalize_claim(claim.text))
+        size = estimate_claim_bytes(claim)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+
+        # Keep a private copy so callers can't mutate the cached lists
+        claim = copy_claim(claim)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (claim, size, self.clock())
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry; counters are kept"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss/eviction counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+# Process-wide caches, one per domain, used by engines unless given their own
+_SHARED_CACHES: Dict[str, ClaimCache] = {}
+_SHARED_CACHES_LOCK = threading.Lock()
+
+
+def shared_claim_cache(domain: str) -> ClaimCache:
+    """The process-wide claim cache for a domain"""
+    with _SHARED_CACHES_LOCK:
+        if domain not in _SHARED_CACHES:
+            _SHARED_CACHES[domain] = ClaimCache()
+        return _SHARED_CACHES[domain]
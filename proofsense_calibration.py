@@ -0,0 +1,172 @@
+"""
+ProofSense AI - Threshold Calibration
+Evaluate many scoring profiles over a corpus with one retrieval pass
+
+A profile is a dict with any of "scoring_weights", "risk_thresholds" and
+"similarity_threshold" (missing keys fall back to the engine's settings).
+Evidence is retrieved once per distinct claim at the lowest similarity
+threshold of all profiles; since ranked evidence only ever loses its tail
+as the threshold rises, every profile's evidence lists are prefixes of
+those rows. The sweep then scores all claims under all profiles with array
+operations, giving exactly what verify_answer would report per profile.
+
+Usage:
+    python proofsense_calibration.py answers.txt --domain health --verified 60 70 80
+"""
+
+import argparse
+import itertools
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import EVIDENCE_SETTINGS
+from proofsense_cache import normalize_claim
+from proofsense_scoring import pad_scores
+
+PROFILE_KEYS = ("scoring_weights", "risk_thresholds", "similarity_threshold")
+
+# Bound on the (profiles x claims x top-k) comparisons evaluated at once
+SWEEP_CHUNK_CELLS = 1 << 24
+
+
+def profile_grid(scoring_weights: Optional[Sequence[Dict[str, float]]] = None,
+                 risk_thresholds: Optional[Sequence[Dict[str, float]]] = None,
+                 similarity_threshold: Optional[Sequence[float]] = None) -> List[Dict]:
+    """Every combination of the given settings, one profile per combination"""
+    axes = {key: values for key, values in zip(PROFILE_KEYS, (scoring_weights, risk_thresholds,
+                                                              similarity_threshold)) if values}
+    return [dict(zip(axes, values)) for values in itertools.product(*axes.values())]
+
+
+def collect_scores(engine, answers: Sequence[str], threshold: float,
+                   top_k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Padded evidence scores and counts for every claim of every answer
+
+    Repeated claims (after normalization) are retrieved once; ``top_k``
+    defaults to the engine's.
+    """
+    top_k = engine.top_k if top_k is None else top_k
+    claims = [claim for answer in answers for claim in engine.extract_claims(answer)]
+    first_seen = {}
+    for claim in claims:
+        first_seen.setdefault(normalize_claim(claim), (len(first_seen), claim))
+    rows = np.array([first_seen[normalize_claim(claim)][0] for claim in claims], dtype=np.int64)
+    unique_claims = [claim for _, claim in first_seen.values()]
+
+    scores, counts = pad_scores(engine.retrieve_evidence_batch(unique_claims, top_k, threshold), width=top_k)
+    return scores[rows], counts[rows]
+
+
+def sweep_profiles(scores: np.ndarray, counts: np.ndarray, profiles: Sequence[Dict],
+                   full_support: Optional[int] = None) -> List[Dict]:
+    """Aggregate verification metrics per complete profile, vectorized over profiles and claims"""
+    full_support = EVIDENCE_SETTINGS["top_k"] if full_support is None else full_support
+    num_claims, width = scores.shape
+    weights = np.array([[p["scoring_weights"][key] for key in ("best_match", "source_count", "avg_quality")]
+                        for p in profiles], dtype=np.float64).reshape(-1, 3)
+    cutoffs = np.array([[p["risk_thresholds"][key] for key in ("verified", "low", "medium")]
+                        for p in profiles], dtype=np.float64).reshape(-1, 3)
+    similarity = np.array([p["similarity_threshold"] for p in profiles], dtype=np.float64)
+
+    valid = np.arange(width) < counts[:, None]
+    prefix_sums = np.concatenate([np.zeros((num_claims, 1)), np.cumsum(scores, axis=1)], axis=1)
+    best_match = scores[:, 0] if width else np.zeros(num_claims)
+    claim_rows = np.arange(num_claims)
+
+    distributions = np.zeros((len(profiles), 4), dtype=np.int64)
+    score_totals = np.zeros(len(profiles))
+    chunk = max(1, SWEEP_CHUNK_CELLS // max(1, num_claims * max(width, 1)))
+    for start in range(0, len(profiles), chunk):
+        part = slice(start, start + chunk)
+        # Evidence kept under each profile's threshold is a prefix of the ranked row
+        kept = ((scores[None] > similarity[part, None, None]) & valid[None]).sum(axis=2)
+        has_evidence = kept > 0
+
+        source_count = np.minimum(kept / full_support, 1.0)
+        avg_quality = np.divide(prefix_sums[claim_rows, kept], kept, out=np.zeros(kept.shape),
+                                where=has_evidence)
+        confidence = (
+            np.where(has_evidence, best_match, 0.0) * weights[part, 0, None] +
+            source_count * weights[part, 1, None] +
+            avg_quality * weights[part, 2, None]
+        ) * 100
+        confidence = np.where(has_evidence, confidence, 0.0)
+
+        levels = np.select([confidence >= cutoffs[part, i, None] for i in range(3)], [0, 1, 2], 3)
+        levels = np.where(has_evidence, levels, 3)
+        for level in range(4):
+            distributions[part, level] = (levels == level).sum(axis=1)
+        score_totals[part] = confidence.sum(axis=1)
+
+    results = []
+    for profile, distribution, score_total in zip(profiles, distributions.tolist(), score_totals.tolist()):
+        risk_counts = dict(zip(("verified", "low", "medium", "high"), distribution))
+        verified_count = risk_counts["verified"] + risk_counts["low"]
+        results.append({
+            "profile": profile,
+            "overall_score": score_total / num_claims if num_claims else 0.0,
+            "total_claims": num_claims,
+            "verified_claims": verified_count,
+            "flagged_claims": risk_counts["medium"] + risk_counts["high"],
+            "evidence_coverage": verified_count / num_claims * 100 if num_claims else 0.0,
+            "risk_distribution": risk_counts,
+        })
+    return results
+
+
+def calibrate(engine, answers: Sequence[str], profiles: Sequence[Dict], top_k: Optional[int] = None) -> List[Dict]:
+    """Risk distribution and evidence coverage of a corpus under each profile
+
+    Retrieval runs once per distinct claim; ``overall_score`` is the mean
+    confidence over all claims of the corpus. ``top_k`` defaults to the
+    engine's, which is also the source count that earns full credit.
+    """
+    top_k = engine.top_k if top_k is None else top_k
+    defaults = {
+        "scoring_weights": engine.scoring_weights,
+        "risk_thresholds": engine.risk_thresholds,
+        "similarity_threshold": engine.similarity_threshold,
+    }
+    profiles = [{**defaults, **profile} for profile in profiles]
+    if not profiles:
+        return []
+
+    threshold = min(profile["similarity_threshold"] for profile in profiles)
+    scores, counts = collect_scores(engine, answers, threshold, top_k)
+    return sweep_profiles(scores, counts, profiles, full_support=engine.top_k)
+
+
+if __name__ == "__main__":
+    from proofsense_core import get_engine
+
+    parser = argparse.ArgumentParser(description="Sweep scoring profiles over a corpus of answers")
+    parser.add_argument("path", help="Text file with one answer per line")
+    parser.add_argument("--domain", default="general")
+    parser.add_argument("--similarity", type=float, nargs="+", default=[0.1], help="Similarity thresholds")
+    parser.add_argument("--verified", type=float, nargs="+", default=[70], help="Verified score cut-offs")
+    parser.add_argument("--best-match", type=float, nargs="+", default=[0.5], help="Best-match weights")
+    args = parser.parse_args()
+
+    with open(args.path, encoding="utf-8") as f:
+        answers = [line.strip() for line in f if line.strip()]
+
+    engine = get_engine(args.domain)
+    profiles = profile_grid(
+        scoring_weights=[{"best_match": w, "source_count": (1 - w) * 0.6, "avg_quality": (1 - w) * 0.4}
+                         for w in args.best_match],
+        risk_thresholds=[{**engine.risk_thresholds, "verified": v} for v in args.verified],
+        similarity_threshold=args.similarity,
+    )
+
+    print("🎛️ ProofSense AI - Calibration Sweep\n")
+    start = time.time()
+    results = calibrate(engine, answers, profiles)
+    print(f"{len(profiles)} profiles over {len(answers)} answers in {time.time() - start:.2f}s\n")
+    for result in results:
+        profile = result["profile"]
+        print(f"best_match={profile['scoring_weights']['best_match']:.2f} "
+              f"verified>={profile['risk_thresholds']['verified']:.0f} "
+              f"similarity>{profile['similarity_threshold']:.2f}: "
+              f"coverage {result['evidence_coverage']:.1f}% {result['risk_distribution']}")
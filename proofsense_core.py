@@ -3,13 +3,47 @@ ProofSense AI - Core Engine (Standalone)
 Can be imported and used without Streamlit
 """
 
+import asyncio
+import itertools
 import json
+import multiprocessing
+import os
 import re
-from typing import List, Dict, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator, Union
 import numpy as np
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
+from config import (ADVANCED, CLAIM_TYPES, EVIDENCE_SETTINGS, OVERCONFIDENT_PATTERNS, RISK_THRESHOLDS,
+                    SCORING_WEIGHTS)
+from proofsense_async import AsyncEvidenceBackend, LocalEvidenceBackend
+from proofsense_cache import ClaimCache, copy_claim, normalize_claim, shared_claim_cache
+from proofsense_dense import HashedDenseIndex
+from proofsense_index import EvidenceIndex, STOP_WORDS, tokenize, jaccard_similarity
+from proofsense_language import ClaimTypeClassifier, OverconfidenceMatcher
+from proofsense_lsh import MinHashLSH
+from proofsense_ranking import SCORERS
+from proofsense_scoring import score_evidence_lists
+from proofsense_snapshot import knowledge_base_hash, snapshot_path, load_snapshot, save_snapshot
+from proofsense_store import EvidenceStore, store_content_hash
+
+# Candidate search backends selectable via ProofSenseEngine(retrieval=...)
+RETRIEVAL_BACKENDS = ("exact", "lsh", "dense")
+
+# Evidence scoring functions selectable via ProofSenseEngine(scorer=...)
+SCORING_FUNCTIONS = ("jaccard",) + tuple(SCORERS)
+
+# Answers sent to a verify_batch worker per task
+BATCH_CHUNK_SIZE = 32
+
+# Fewest claims worth handing to a retrieval thread of its own
+MIN_CLAIMS_PER_THREAD = 16
+
+# Evidence lookups in flight at once per averify_answer / averify_batch call
+ASYNC_CONCURRENCY = 32
+
 # Knowledge base simulation
 KNOWLEDGE_BASE = {
     "general": [
@@ -58,6 +92,8 @@ class Claim:
     evidence: List[str]
     warnings: List[str]
     explanation: str
+    claim_type: str = "📚 Factual"
+    claim_type_desc: str = ""
     
     def to_dict(self):
         return asdict(self)
@@ -85,107 +121,304 @@ class VerificationResult:
             "risk_distribution": self.risk_distribution,
         }
 
+@dataclass
+class VerificationSummary:
+    """Aggregate fields of a VerificationResult, emitted last by verify_answer_stream"""
+    original_answer: str
+    overall_score: float
+    total_claims: int
+    verified_claims: int
+    flagged_claims: int
+    evidence_coverage: float
+    risk_distribution: Dict[str, int]
+    
+    def to_dict(self):
+        return asdict(self)
+
 class ProofSenseEngine:
     """Core verification engine for ProofSense AI"""
     
-    def __init__(self, domain: str = "general"):
+    def __init__(self, domain: str = "general", retrieval: str = "exact",
+                 retrieval_options: Optional[Dict] = None, evidence_store: Optional[EvidenceStore] = None,
+                 scorer: str = "jaccard", scorer_options: Optional[Dict] = None,
+                 snapshot_dir: Optional[str] = None, cache: Optional[ClaimCache] = None,
+                 claim_workers: Optional[int] = None, evidence_backend: Optional[AsyncEvidenceBackend] = None):
+        if retrieval not in RETRIEVAL_BACKENDS:
+            raise ValueError(f"Unknown retrieval backend '{retrieval}', expected one of {RETRIEVAL_BACKENDS}")
+        if scorer not in SCORING_FUNCTIONS:
+            raise ValueError(f"Unknown scorer '{scorer}', expected one of {SCORING_FUNCTIONS}")
+        
         self.domain = domain
-        self.knowledge_base = KNOWLEDGE_BASE.get(domain, KNOWLEDGE_BASE["general"])
+        self.retrieval = retrieval
+        self.retrieval_options = retrieval_options or {}
+        self.scorer_name = scorer
+        self.scorer_options = scorer_options or {}
         
-        # Overconfident language patterns
-        self.overconfident_patterns = [
-            r'\balways\b', r'\bnever\b', r'\bguaranteed\b', r'\bcertainly\b',
-            r'\bdefinitely\b', r'\bimpossible\b', r'\bno doubt\b', r'\bwithout question\b',
-            r'\b100%\b', r'\babsolutely\b', r'\bundoubtedly\b', r'\binevitably\b'
-        ]
+        snapshot = None
+        if evidence_store is not None:
+            # Memory-mapped store: texts and index are used in place, nothing is rebuilt
+            self.knowledge_base = evidence_store.texts
+            self.index = evidence_store.index
+        else:
+            self.knowledge_base = KNOWLEDGE_BASE.get(domain, KNOWLEDGE_BASE["general"])
+            
+            if snapshot_dir is not None:
+                # Warm start: reuse structures built by an earlier process for identical content.
+                # Keyed on the backend's resolved build parameters, so changed defaults miss too
+                backend_class = {"lsh": MinHashLSH, "dense": HashedDenseIndex}.get(retrieval)
+                backend_config = backend_class.build_config(**self.retrieval_options) if backend_class else {}
+                content_hash = knowledge_base_hash(
+                    self.knowledge_base, {"retrieval": retrieval, "backend": backend_config}
+                )
+                snapshot_file = snapshot_path(snapshot_dir, domain, content_hash)
+                snapshot = load_snapshot(snapshot_file, content_hash)
+            
+            if snapshot is not None:
+                self.index = snapshot.index
+            else:
+                # Evidence is tokenized once into an interned sparse token matrix + inverted index
+                self.index = EvidenceIndex.from_tokens([tokenize(evidence) for evidence in self.knowledge_base])
         
-    def extract_claims(self, text: str) -> List[str]:
-        """Break text into atomic factual claims"""
-        sentences = re.split(r'(?<=[.!?])\s+', text.strip())
+        # Overconfident language patterns (editable; the combined matcher follows changes)
+        self.overconfident_patterns = list(OVERCONFIDENT_PATTERNS)
+        self._overconfidence_matcher = OverconfidenceMatcher(self.overconfident_patterns)
         
-        claims = []
-        for sentence in sentences:
-            if len(sentence.strip()) > 10:
-                sub_claims = re.split(r',\s*(?:and|but|however|moreover)\s+', sentence)
-                claims.extend([c.strip() for c in sub_claims if len(c.strip()) > 10])
+        # Claim type taxonomy in priority order (editable, like the patterns above)
+        self.claim_types = [dict(claim_type) for claim_type in CLAIM_TYPES]
+        self._claim_type_classifier = ClaimTypeClassifier(self.claim_types)
         
-        return claims
+        # Approximate MinHash/LSH candidate search; candidates are still scored exactly
+        backend_snapshot = snapshot.extra_sections if snapshot is not None else None
+        self.lsh = None
+        if retrieval == "lsh":
+            self.lsh = MinHashLSH(self.index, snapshot=backend_snapshot, **(retrieval_options or {}))
+        
+        # Feature-hashed evidence vectors, searched with one matmul per batch of claims
+        self.dense = None
+        if retrieval == "dense":
+            self.dense = HashedDenseIndex(self.knowledge_base, snapshot=backend_snapshot, **(retrieval_options or {}))
+        
+        backend = self.lsh or self.dense
+        if snapshot_dir is not None and evidence_store is None and (
+                snapshot is None or (backend is not None and not backend.from_snapshot)):
+            save_snapshot(snapshot_file, content_hash, self.knowledge_base, self.index,
+                          backend.snapshot_arrays() if backend is not None else None)
+        
+        # BM25/TF-IDF statistics are precomputed here; Jaccard scores straight off the index
+        self.scorer = SCORERS[scorer](self.index, **(scorer_options or {})) if scorer != "jaccard" else None
+        
+        # Minimum similarity for evidence to count as relevant
+        self.similarity_threshold = EVIDENCE_SETTINGS["similarity_threshold"]
+        
+        # Evidence retrieved per claim; also the source count that earns full source-count credit
+        self.top_k = EVIDENCE_SETTINGS["top_k"]
+        
+        # Confidence formula weights and risk cut-offs (editable, defaults from config)
+        self.scoring_weights = dict(SCORING_WEIGHTS)
+        self.risk_thresholds = dict(RISK_THRESHOLDS)
+        
+        # Verified-claim cache; engines of one domain share a process-wide cache by default
+        if cache is None and ADVANCED["use_cache"]:
+            cache = shared_claim_cache(domain)
+        self.cache = cache
+        
+        # Threads retrieving evidence for the claims of one long answer in parallel
+        if claim_workers is None:
+            claim_workers = (os.cpu_count() or 1) if ADVANCED["parallel_processing"] else 1
+        self.claim_workers = claim_workers
+        
+        # Evidence source for the async API; defaults to this engine's own index
+        self.evidence_backend = evidence_backend if evidence_backend is not None else LocalEvidenceBackend(self)
+        self.async_concurrency = ASYNC_CONCURRENCY
+        self._evidence_store = evidence_store
+        self._kb_version = evidence_store.metadata.get("content_hash") if evidence_store is not None else None
+    
+    @property
+    def kb_version(self) -> str:
+        """Content hash of the knowledge base: from the store header, else computed on first use"""
+        if self._kb_version is None:
+            if self._evidence_store is not None:
+                # Stores written before content hashes were recorded: hash the mapped blob in slices
+                self._kb_version = store_content_hash(self._evidence_store.texts)
+            else:
+                self._kb_version = knowledge_base_hash(self.knowledge_base)
+        return self._kb_version
+    
+    def cache_namespace(self) -> Tuple[str, str, str]:
+        """Everything besides the claim text that a cached claim depends on"""
+        scoring_config = json.dumps({
+            "retrieval": self.retrieval,
+            "retrieval_options": self.retrieval_options,
+            "scorer": self.scorer_name,
+            "scorer_options": self.scorer_options,
+            "similarity_threshold": self.similarity_threshold,
+            "top_k": self.top_k,
+            "scoring_weights": self.scoring_weights,
+            "risk_thresholds": self.risk_thresholds,
+            "overconfident_patterns": self.overconfident_patterns,
+            "claim_types": self.claim_types,
+        }, sort_keys=True, default=repr)
+        return self.domain, self.kb_version, scoring_config
+        
+    def iter_claim_spans(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Lazily yield (start, end) offsets of the atomic claims in text, sentence by sentence"""
+        start = len(text) - len(text.lstrip())
+        end = len(text.rstrip())
+        for boundary in re.finditer(r'(?<=[.!?])\s+', text[:end]):
+            if boundary.start() >= start:
+                yield from self._sentence_claim_spans(text, start, boundary.start())
+                start = boundary.end()
+        yield from self._sentence_claim_spans(text, start, end)
+    
+    def _sentence_claim_spans(self, text: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+        """Claims within one sentence, split at conjunctions"""
+        sentence = text[start:end]
+        if len(sentence.strip()) <= 10:
+            return
+        
+        piece_start = 0
+        separators = list(re.finditer(r',\s*(?:and|but|however|moreover)\s+', sentence))
+        for piece_end, next_start in [(m.start(), m.end()) for m in separators] + [(len(sentence), None)]:
+            piece = sentence[piece_start:piece_end]
+            if len(piece.strip()) > 10:
+                leading = len(piece) - len(piece.lstrip())
+                yield start + piece_start + leading, start + piece_start + len(piece.rstrip())
+            piece_start = next_start
+    
+    def iter_claims(self, text: str) -> Iterator[str]:
+        """Lazily break text into atomic factual claims, sentence by sentence"""
+        for start, end in self.iter_claim_spans(text):
+            yield text[start:end]
+    
+    def _split_sentence(self, sentence: str) -> Iterator[str]:
+        """Claims within one sentence, split at conjunctions"""
+        for start, end in self._sentence_claim_spans(sentence, 0, len(sentence)):
+            yield sentence[start:end]
+    
+    def extract_claims(self, text: str) -> List[str]:
+        """Break text into atomic factual claims"""
+        return list(self.iter_claims(text))
     
     def calculate_similarity(self, claim: str, evidence: str) -> float:
         """Simple similarity calculation"""
-        claim_words = set(claim.lower().split())
-        evidence_words = set(evidence.lower().split())
+        return jaccard_similarity(tokenize(claim), tokenize(evidence))
+    
+    def retrieve_evidence(self, claim: str, top_k: Optional[int] = None,
+                          threshold: Optional[float] = None) -> List[Tuple[str, float]]:
+        """Retrieve relevant evidence from knowledge base (top_k and threshold default to the engine's)"""
+        if self.dense is not None:
+            return self.retrieve_evidence_batch([claim], top_k, threshold)[0]
         
-        stop_words = {'the', 'a', 'an', 'in', 'on', 'at', 'to', 'for', 'of', 'is', 'are', 'was', 'were'}
-        claim_words -= stop_words
-        evidence_words -= stop_words
+        top_k = self.top_k if top_k is None else top_k
+        threshold = self.similarity_threshold if threshold is None else threshold
+        claim_words = tokenize(claim)
         
-        if not claim_words or not evidence_words:
-            return 0.0
+        if self.lsh is not None:
+            # LSH only shortlists candidates; they are re-ranked with the exact scorer
+            candidate_ids = self.lsh.candidates(claim_words).tolist()
+            matches = (self.scorer or self.index).rerank(claim_words, candidate_ids, top_k, threshold)
+        elif self.scorer is not None:
+            matches = self.scorer.top_k(claim_words, top_k, threshold)
+        else:
+            # Exact top-k with size/prefix filtering; ties rank by knowledge base order
+            matches = self.index.top_k(claim_words, top_k, threshold)
         
-        intersection = claim_words & evidence_words
-        union = claim_words | evidence_words
+        return [(self.knowledge_base[evidence_id], score) for evidence_id, score in matches]
+    
+    def retrieve_evidence_batch(self, claims: List[str], top_k: Optional[int] = None,
+                                threshold: Optional[float] = None) -> List[List[Tuple[str, float]]]:
+        """Retrieve evidence for every claim at once via the sparse token matrix
         
-        return len(intersection) / len(union) if union else 0.0
+        With ``claim_workers`` > 1, long claim lists are split into contiguous
+        chunks retrieved on a thread pool (NumPy scoring and mapped stores
+        release the GIL); results keep the claims' order.
+        """
+        top_k = self.top_k if top_k is None else top_k
+        threshold = self.similarity_threshold if threshold is None else threshold
+        num_chunks = min(self.claim_workers, len(claims) // MIN_CLAIMS_PER_THREAD)
+        if num_chunks > 1:
+            bounds = [len(claims) * i // num_chunks for i in range(num_chunks + 1)]
+            chunks = _claim_executor(self.claim_workers).map(
+                lambda chunk: self._retrieve_evidence_chunk(chunk, top_k, threshold),
+                [claims[start:end] for start, end in zip(bounds, bounds[1:])],
+            )
+            return [evidence for chunk in chunks for evidence in chunk]
+        return self._retrieve_evidence_chunk(claims, top_k, threshold)
     
-    def retrieve_evidence(self, claim: str, top_k: int = 3) -> List[Tuple[str, float]]:
-        """Retrieve relevant evidence from knowledge base"""
-        evidence_scores = []
+    def _retrieve_evidence_chunk(self, claims: List[str], top_k: int,
+                                 threshold: float) -> List[List[Tuple[str, float]]]:
+        if self.dense is not None:
+            matches = self._dense_matches(claims, top_k, threshold)
+        elif self.lsh is not None or self.scorer is not None:
+            return [self.retrieve_evidence(claim, top_k, threshold) for claim in claims]
+        else:
+            matches = self.index.top_k_batch([tokenize(claim) for claim in claims], top_k, threshold)
         
-        for evidence in self.knowledge_base:
-            similarity = self.calculate_similarity(claim, evidence)
-            if similarity > 0.1:
-                evidence_scores.append((evidence, similarity))
+        return [
+            [(self.knowledge_base[evidence_id], score) for evidence_id, score in claim_matches]
+            for claim_matches in matches
+        ]
+    
+    def _dense_matches(self, claims: List[str], top_k: int, threshold: float) -> List[List[Tuple[int, float]]]:
+        """Dense nearest neighbours for all claims, optionally re-scored by the exact scorer"""
+        if not self.dense.rerank:
+            shortlists = self.dense.search_batch(claims, top_k)
+            return [[(i, score) for i, score in shortlist if score > threshold]
+                    for shortlist in shortlists]
         
-        evidence_scores.sort(key=lambda x: x[1], reverse=True)
-        return evidence_scores[:top_k]
+        shortlists = self.dense.search_batch(claims, max(top_k, self.dense.shortlist))
+        return [
+            (self.scorer or self.index).rerank(tokenize(claim), [i for i, _ in shortlist], top_k, threshold)
+            for claim, shortlist in zip(claims, shortlists)
+        ]
+    
+    def _matcher(self) -> OverconfidenceMatcher:
+        # Recompile only if overconfident_patterns was changed since the last call
+        if self._overconfidence_matcher.patterns != tuple(self.overconfident_patterns):
+            self._overconfidence_matcher = OverconfidenceMatcher(self.overconfident_patterns)
+        return self._overconfidence_matcher
     
     def detect_overconfident_language(self, claim: str) -> List[str]:
         """Detect overconfident or absolute language"""
-        warnings = []
-        claim_lower = claim.lower()
-        
-        for pattern in self.overconfident_patterns:
-            matches = re.findall(pattern, claim_lower)
-            if matches:
-                warnings.append(f"Overconfident language detected: '{matches[0]}'")
-        
-        return warnings
+        return self._matcher().warnings(claim)
+    
+    def detect_overconfident_language_batch(self, answer: str, spans: List[Tuple[int, int]],
+                                            lowered: Optional[str] = None) -> List[List[str]]:
+        """Warnings for every claim span of an answer from a single scan of the answer"""
+        return self._matcher().warnings_batch(answer, spans, lowered)
+    
+    def _classifier(self) -> ClaimTypeClassifier:
+        # Recompile only if claim_types was changed since the last call
+        if self._claim_type_classifier.taxonomy != ClaimTypeClassifier.freeze(self.claim_types):
+            self._claim_type_classifier = ClaimTypeClassifier(self.claim_types)
+        return self._claim_type_classifier
+    
+    def detect_claim_type(self, claim: str) -> Tuple[str, str]:
+        """Classify a claim as (type label, description) using the claim type taxonomy"""
+        return self._classifier().classify(claim)
+    
+    def detect_claim_type_batch(self, answer: str, spans: List[Tuple[int, int]],
+                                lowered: Optional[str] = None) -> List[Tuple[str, str]]:
+        """Claim types for every claim span of an answer from a single scan of the answer"""
+        return self._classifier().classify_batch(answer, spans, lowered)
     
     def calculate_claim_score(self, claim: str, evidence_list: List[Tuple[str, float]]) -> Tuple[float, str]:
         """Calculate confidence score for a single claim"""
-        if not evidence_list:
-            return 0.0, "high"
-        
-        best_match_score = evidence_list[0][1] if evidence_list else 0.0
-        source_count_factor = min(len(evidence_list) / 3, 1.0)
-        avg_evidence_score = np.mean([score for _, score in evidence_list]) if evidence_list else 0.0
-        
-        confidence_score = (
-            best_match_score * 0.5 +
-            source_count_factor * 0.3 +
-            avg_evidence_score * 0.2
-        ) * 100
-        
-        if confidence_score >= 70:
-            risk_level = "verified"
-        elif confidence_score >= 50:
-            risk_level = "low"
-        elif confidence_score >= 30:
-            risk_level = "medium"
-        else:
-            risk_level = "high"
-        
-        return confidence_score, risk_level
+        return self.score_claims([evidence_list])[0]
+    
+    def score_claims(self, evidence_lists: List[List[Tuple[str, float]]]) -> List[Tuple[float, str]]:
+        """Confidence score and risk level for many claims in one vectorized kernel call"""
+        return score_evidence_lists(evidence_lists, weights=self.scoring_weights, thresholds=self.risk_thresholds,
+                                    full_support=self.top_k)
     
     def generate_explanation(self, claim: str, score: float, evidence_list: List[Tuple[str, float]], 
                            warnings: List[str]) -> str:
         """Generate human-readable explanation"""
-        if score >= 70:
+        if score >= self.risk_thresholds["verified"]:
             explanation = f"✅ This claim is well-supported with strong evidence (verifiability confidence: {score:.1f}/100)."
-        elif score >= 50:
+        elif score >= self.risk_thresholds["low"]:
             explanation = f"⚠️ This claim has moderate support but could benefit from additional verification (verifiability confidence: {score:.1f}/100)."
-        elif score >= 30:
+        elif score >= self.risk_thresholds["medium"]:
             explanation = f"⚠️ This claim has weak support in available sources (verifiability confidence: {score:.1f}/100). Exercise caution."
         else:
             explanation = f"❌ This claim lacks supporting evidence in retrieved sources (verifiability confidence: {score:.1f}/100). High risk of hallucination."
@@ -200,46 +433,382 @@ class ProofSenseEngine:
         
         return explanation
     
-    def verify_answer(self, answer: str) -> VerificationResult:
-        """Main verification pipeline"""
-        claim_texts = self.extract_claims(answer)
+    def _build_claim(self, claim_text: str, evidence_list: List[Tuple[str, float]],
+                     warnings: Optional[List[str]] = None, claim_type: Optional[Tuple[str, str]] = None,
+                     scored: Optional[Tuple[float, str]] = None) -> Claim:
+        """Score, flag, classify and explain one claim (score/warnings/type may come from a batch)"""
+        score, risk_level = scored if scored is not None else self.calculate_claim_score(claim_text, evidence_list)
+        if warnings is None:
+            warnings = self.detect_overconfident_language(claim_text)
+        if claim_type is None:
+            claim_type = self.detect_claim_type(claim_text)
+        explanation = self.generate_explanation(claim_text, score, evidence_list, warnings)
         
-        verified_claims = []
-        risk_counts = {"verified": 0, "low": 0, "medium": 0, "high": 0}
+        return Claim(
+            text=claim_text,
+            confidence_score=score,
+            risk_level=risk_level,
+            evidence=[ev for ev, _ in evidence_list],
+            warnings=warnings,
+            explanation=explanation,
+            claim_type=claim_type[0],
+            claim_type_desc=claim_type[1]
+        )
+    
+    def verify_claims(self, claim_texts: List[str], warnings: Optional[List[List[str]]] = None,
+                      claim_types: Optional[List[Tuple[str, str]]] = None) -> List[Claim]:
+        """Verify extracted claims; repeats are computed once and served from the claim cache
         
-        for claim_text in claim_texts:
-            evidence_list = self.retrieve_evidence(claim_text)
-            score, risk_level = self.calculate_claim_score(claim_text, evidence_list)
-            warnings = self.detect_overconfident_language(claim_text)
-            explanation = self.generate_explanation(claim_text, score, evidence_list, warnings)
-            
-            claim = Claim(
-                text=claim_text,
-                confidence_score=score,
-                risk_level=risk_level,
-                evidence=[ev for ev, _ in evidence_list],
-                warnings=warnings,
-                explanation=explanation
-            )
-            
-            verified_claims.append(claim)
-            risk_counts[risk_level] += 1
+        ``warnings`` and ``claim_types`` may be passed in from a batch scan of
+        the whole answer; otherwise each claim is scanned on its own.
+        """
+        positions, unique = self._dedupe_claims(claim_texts, warnings, claim_types)
+        claims, missing, namespace = self._cached_claims(unique[0])
+        evidence_lists = self.retrieve_evidence_batch([unique[0][i] for i in missing])
+        self._complete_claims(claims, missing, evidence_lists, namespace, *unique)
+        return self._fan_out_claims(claim_texts, positions, claims)
+    
+    def _dedupe_claims(self, claim_texts: List[str], warnings: Optional[List[List[str]]],
+                       claim_types: Optional[List[Tuple[str, str]]]) -> Tuple[List[int], Tuple[List, List, List]]:
+        """Position of each claim's first occurrence, plus texts/warnings/types of distinct claims"""
+        # Each distinct (normalized) claim is verified once, then fanned back out in order
+        first_seen = {}
+        positions = [first_seen.setdefault(normalize_claim(text), i) for i, text in enumerate(claim_texts)]
+        unique_positions = list(first_seen.values())
+        
+        def pick(values):
+            return [values[i] for i in unique_positions] if values is not None else [None] * len(unique_positions)
         
-        overall_score = np.mean([c.confidence_score for c in verified_claims]) if verified_claims else 0.0
+        return positions, (pick(claim_texts), pick(warnings), pick(claim_types))
+    
+    def _fan_out_claims(self, claim_texts: List[str], positions: List[int], unique_claims: List[Claim]) -> List[Claim]:
+        """Distinct claims back in answer order; repeats get their own copies"""
+        by_position = dict(zip(sorted(set(positions)), unique_claims))
+        return [
+            by_position[i] if i == position else copy_claim(by_position[position], claim_texts[i])
+            for i, position in enumerate(positions)
+        ]
+    
+    def _cached_claims(self, claim_texts: List[str],
+                       namespace_extra: Tuple = ()) -> Tuple[List[Optional[Claim]], List[int], Optional[Tuple]]:
+        """Cached claims (None where missing), the indices still to verify and the cache namespace"""
+        if self.cache is None:
+            return [None] * len(claim_texts), list(range(len(claim_texts))), None
+        namespace = self.cache_namespace() + namespace_extra
+        claims = [self.cache.get(namespace, claim_text) for claim_text in claim_texts]
+        return claims, [i for i, claim in enumerate(claims) if claim is None], namespace
+    
+    def _complete_claims(self, claims: List[Optional[Claim]], missing: List[int],
+                         evidence_lists: List[List[Tuple[str, float]]], namespace: Optional[Tuple],
+                         claim_texts: List[str],
+                         warnings: List[Optional[List[str]]], claim_types: List[Optional[Tuple[str, str]]]) -> None:
+        """Score and build the missing claims in place from their evidence, caching them"""
+        for i, evidence_list, scored in zip(missing, evidence_lists, self.score_claims(evidence_lists)):
+            claims[i] = self._build_claim(claim_texts[i], evidence_list, warnings[i], claim_types[i], scored)
+            if self.cache is not None:
+                self.cache.put(namespace, claims[i])
+    
+    def _summarize(self, answer: str, claims: List[Claim]) -> VerificationSummary:
+        """Aggregate metrics over scored claims"""
+        risk_counts = {"verified": 0, "low": 0, "medium": 0, "high": 0}
+        for claim in claims:
+            risk_counts[claim.risk_level] += 1
+        
+        overall_score = np.mean([c.confidence_score for c in claims]) if claims else 0.0
         verified_count = risk_counts["verified"] + risk_counts["low"]
         flagged_count = risk_counts["medium"] + risk_counts["high"]
-        evidence_coverage = (verified_count / len(verified_claims) * 100) if verified_claims else 0.0
+        evidence_coverage = (verified_count / len(claims) * 100) if claims else 0.0
         
-        return VerificationResult(
+        return VerificationSummary(
             original_answer=answer,
-            claims=verified_claims,
             overall_score=overall_score,
-            total_claims=len(verified_claims),
+            total_claims=len(claims),
             verified_claims=verified_count,
             flagged_claims=flagged_count,
             evidence_coverage=evidence_coverage,
             risk_distribution=risk_counts
         )
+    
+    def _build_result(self, answer: str, claims: List[Claim]) -> VerificationResult:
+        """Full result for an answer from its verified claims"""
+        summary = self._summarize(answer, claims)
+        return VerificationResult(
+            original_answer=answer,
+            claims=claims,
+            overall_score=summary.overall_score,
+            total_claims=summary.total_claims,
+            verified_claims=summary.verified_claims,
+            flagged_claims=summary.flagged_claims,
+            evidence_coverage=summary.evidence_coverage,
+            risk_distribution=summary.risk_distribution
+        )
+    
+    def _scan_answer(self, answer: str) -> Tuple[List[str], List[List[str]], List[Tuple[str, str]]]:
+        """Claims of an answer with their warnings and types"""
+        spans = list(self.iter_claim_spans(answer))
+        claim_texts = [answer[start:end] for start, end in spans]
+        
+        # Warnings and claim types come from one lowercased copy of the whole answer
+        lowered = answer.lower()
+        warnings = self.detect_overconfident_language_batch(answer, spans, lowered)
+        claim_types = self.detect_claim_type_batch(answer, spans, lowered)
+        return claim_texts, warnings, claim_types
+    
+    def verify_answer(self, answer: str) -> VerificationResult:
+        """Main verification pipeline"""
+        return self._build_result(answer, self.verify_claims(*self._scan_answer(answer)))
+    
+    def verify_answers(self, answers: List[str], max_claims: Optional[int] = None) -> List[VerificationResult]:
+        """Verify several answers with one batched retrieval and scoring pass over all their claims
+        
+        With ``max_claims``, consecutive answers are grouped into passes of at
+        most that many claims (an answer with more claims gets a pass of its
+        own), so the work of one pass is bounded by claims, not answers.
+        """
+        scanned = [self._scan_answer(answer) for answer in answers]
+        groups, group, group_claims = [], [], 0
+        for item in zip(answers, scanned):
+            count = len(item[1][0])
+            if group and max_claims and group_claims + count > max_claims:
+                groups.append(group)
+                group, group_claims = [], 0
+            group.append(item)
+            group_claims += count
+        groups.append(group)
+        
+        results = []
+        for group in groups:
+            claims = self.verify_claims(*(
+                [item for _, answer_scan in group for item in answer_scan[field]] for field in range(3)
+            ))
+            start = 0
+            for answer, (claim_texts, _, _) in group:
+                results.append(self._build_result(answer, claims[start:start + len(claim_texts)]))
+                start += len(claim_texts)
+        return results
+    
+    async def aretrieve_evidence(self, claim: str, top_k: Optional[int] = None, threshold: Optional[float] = None,
+                                 limiter: Optional[asyncio.Semaphore] = None) -> List[Tuple[str, float]]:
+        """Retrieve evidence through the async evidence backend, within ``limiter`` if given"""
+        top_k = self.top_k if top_k is None else top_k
+        threshold = self.similarity_threshold if threshold is None else threshold
+        if limiter is None:
+            return await self.evidence_backend.retrieve(claim, top_k, threshold)
+        async with limiter:
+            return await self.evidence_backend.retrieve(claim, top_k, threshold)
+    
+    async def averify_answer(self, answer: str, limiter: Optional[asyncio.Semaphore] = None) -> VerificationResult:
+        """Async verification pipeline; the answer's evidence lookups run concurrently
+        
+        At most ``async_concurrency`` lookups are in flight unless a shared
+        ``limiter`` is passed (as averify_batch does). Results match
+        verify_answer when the backend returns the same evidence.
+        """
+        limiter = limiter if limiter is not None else asyncio.Semaphore(self.async_concurrency)
+        claim_texts, warnings, claim_types = self._scan_answer(answer)
+        positions, unique = self._dedupe_claims(claim_texts, warnings, claim_types)
+        
+        # The bundled local backend returns exactly what the sync path would, so it shares cache entries
+        local = isinstance(self.evidence_backend, LocalEvidenceBackend) and self.evidence_backend.engine is self
+        claims, missing, namespace = self._cached_claims(unique[0], () if local else (self.evidence_backend.name,))
+        evidence_lists = await asyncio.gather(*(
+            self.aretrieve_evidence(unique[0][i], limiter=limiter) for i in missing
+        ))
+        self._complete_claims(claims, missing, list(evidence_lists), namespace, *unique)
+        return self._build_result(answer, self._fan_out_claims(claim_texts, positions, claims))
+    
+    async def averify_batch(self, answers: Iterable[str], concurrency: Optional[int] = None) -> List[VerificationResult]:
+        """Verify many answers on one event loop, sharing one bound on lookups in flight"""
+        limiter = asyncio.Semaphore(concurrency or self.async_concurrency)
+        return list(await asyncio.gather(*(self.averify_answer(answer, limiter) for answer in answers)))
+    
+    def reverify_answer(self, previous: VerificationResult, answer: str) -> VerificationResult:
+        """Verify an edited answer, reusing previous Claim objects for unchanged claims
+        
+        Only added or changed claims go through retrieval and scoring, so the
+        cost follows the size of the edit. ``previous`` must come from an
+        engine with the same domain and configuration.
+        """
+        reusable = {}
+        for claim in previous.claims:
+            reusable.setdefault(claim.text, []).append(claim)
+        
+        claim_texts = self.extract_claims(answer)
+        claims = [reusable[text].pop(0) if reusable.get(text) else None for text in claim_texts]
+        changed = [i for i, claim in enumerate(claims) if claim is None]
+        for i, claim in zip(changed, self.verify_claims([claim_texts[i] for i in changed])):
+            claims[i] = claim
+        
+        return self._build_result(answer, claims)
+    
+    def verify_answer_stream(self, answer: str, batch_size: int = 8) -> Iterator[Union[Claim, VerificationSummary]]:
+        """Yield each Claim as soon as it is scored, then one VerificationSummary
+        
+        Claims are extracted lazily and retrieved ``batch_size`` at a time, so
+        time to the first claim does not grow with the answer's length.
+        """
+        claims = []
+        claim_texts = self.iter_claims(answer)
+        while True:
+            batch = list(itertools.islice(claim_texts, batch_size))
+            if not batch:
+                break
+            for claim in self.verify_claims(batch):
+                claims.append(claim)
+                yield claim
+        
+        yield self._summarize(answer, claims)
+    
+    def verify_batch(self, answers: Iterable[str], workers: Optional[int] = None,
+                     chunksize: int = BATCH_CHUNK_SIZE, start_method: Optional[str] = None) -> List[VerificationResult]:
+        """Verify many answers across a process pool; results come back in input order"""
+        return [result for _, result in self.iter_verify_batch(answers, workers, ordered=True, chunksize=chunksize,
+                                                               start_method=start_method)]
+    
+    def iter_verify_batch(self, answers: Iterable[str], workers: Optional[int] = None, ordered: bool = False,
+                          chunksize: int = BATCH_CHUNK_SIZE,
+                          start_method: Optional[str] = None) -> Iterator[Tuple[int, VerificationResult]]:
+        """Yield (answer index, result) pairs as worker processes finish them
+        
+        Each worker receives this engine once, through the pool initializer,
+        and then verifies ``chunksize`` answers per task. ``workers``
+        defaults to one per CPU when ADVANCED["parallel_processing"] is on,
+        otherwise answers are verified in this process.
+        
+        ``start_method`` defaults to the platform's, except that a process
+        already running other threads is never forked (see
+        _batch_start_method). Only under fork is the index shared
+        copy-on-write; spawn and forkserver workers unpickle their own copy.
+        """
+        if workers is None:
+            workers = (os.cpu_count() or 1) if ADVANCED["parallel_processing"] else 1
+        if workers <= 1:
+            for i, answer in enumerate(answers):
+                yield i, self.verify_answer(answer)
+            return
+        
+        numbered = enumerate(answers)
+        chunks = iter(lambda: list(itertools.islice(numbered, chunksize)), [])
+        with multiprocessing.get_context(_batch_start_method(start_method)).Pool(workers, _init_batch_worker, (self,)) as pool:
+            results = pool.imap(_verify_batch_chunk, chunks) if ordered else pool.imap_unordered(_verify_batch_chunk, chunks)
+            for chunk_results in results:
+                yield from chunk_results
+
+# Process-wide retrieval thread pools by size, recreated after a fork
+_CLAIM_EXECUTORS: Dict[Tuple[int, int], ThreadPoolExecutor] = {}
+_CLAIM_EXECUTORS_LOCK = threading.Lock()
+
+def _claim_executor(workers: int) -> ThreadPoolExecutor:
+    key = (os.getpid(), workers)
+    with _CLAIM_EXECUTORS_LOCK:
+        if key not in _CLAIM_EXECUTORS:
+            _CLAIM_EXECUTORS[key] = ThreadPoolExecutor(workers, thread_name_prefix="proofsense-claims")
+        return _CLAIM_EXECUTORS[key]
+
+# Engine of a verify_batch worker process, set once by the pool initializer
+_BATCH_WORKER_ENGINE: Optional[ProofSenseEngine] = None
+
+def _init_batch_worker(engine: ProofSenseEngine) -> None:
+    global _BATCH_WORKER_ENGINE
+    _BATCH_WORKER_ENGINE = engine
+
+def _batch_start_method(start_method: Optional[str]) -> str:
+    """Start method for verify_batch pools: as requested, else the platform default
+    
+    Forking a process that runs other threads (claim pool, HTTP server,
+    batchers) can copy a lock mid-acquire into the child and deadlock it, so
+    a multi-threaded parent uses forkserver (or spawn) instead of fork.
+    """
+    if start_method is not None:
+        return start_method
+    start_method = multiprocessing.get_start_method()
+    if start_method == "fork" and threading.active_count() > 1:
+        return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return start_method
+
+def _verify_batch_chunk(chunk: List[Tuple[int, str]]) -> List[Tuple[int, VerificationResult]]:
+    return [(i, _BATCH_WORKER_ENGINE.verify_answer(answer)) for i, answer in chunk]
+
+class IncrementalVerifier:
+    """Verifies an answer while it is still being generated
+    
+    Feed text chunks as they arrive (e.g. LLM tokens). Every sentence whose
+    boundary has been seen is split and verified immediately with the same
+    rules as extract_claims; only the trailing partial sentence is held
+    back until finish().
+    """
+    
+    SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+    
+    def __init__(self, engine: ProofSenseEngine):
+        self.engine = engine
+        self.claims: List[Claim] = []
+        self._chunks: List[str] = []
+        self._pending = ""
+        self._scan_from = 0
+        self._finished = False
+    
+    def _verify(self, sentence: str) -> List[Claim]:
+        claims = self.engine.verify_claims(list(self.engine._split_sentence(sentence)))
+        self.claims.extend(claims)
+        return claims
+    
+    def feed(self, chunk: str) -> List[Claim]:
+        """Add generated text; returns the claims completed by it"""
+        if self._finished:
+            raise ValueError("Cannot feed an IncrementalVerifier after finish()")
+        self._chunks.append(chunk)
+        self._pending += chunk
+        
+        completed = []
+        # Only text after the last scan can hold a new boundary (the lookbehind still sees one char back)
+        boundary = self.SENTENCE_BOUNDARY.search(self._pending, self._scan_from)
+        while boundary is not None:
+            completed.extend(self._verify(self._pending[:boundary.start()]))
+            self._pending = self._pending[boundary.end():]
+            boundary = self.SENTENCE_BOUNDARY.search(self._pending)
+        self._scan_from = len(self._pending)
+        return completed
+    
+    def finish(self) -> VerificationResult:
+        """Verify the trailing sentence and return the result for the whole answer"""
+        if not self._finished:
+            # verify_answer drops trailing whitespace before splitting; so must the held-back sentence
+            self._verify(self._pending.rstrip())
+            self._pending = ""
+            self._finished = True
+        
+        answer = "".join(self._chunks)
+        return self.engine._build_result(answer, list(self.claims))
+
+# Process-wide warmed engines, shared by every caller (Streamlit sessions, API workers)
+_ENGINE_REGISTRY: Dict[Tuple[str, str], ProofSenseEngine] = {}
+_ENGINE_REGISTRY_LOCK = threading.Lock()
+
+def get_engine(domain: str = "general", **engine_options) -> ProofSenseEngine:
+    """Return the shared engine for a domain/configuration, building it on first use
+    
+    Engines are treated as immutable once built, so one instance (and its
+    index) serves concurrent requests. Call invalidate_engines() after the
+    knowledge base changes.
+    """
+    key = (domain, json.dumps(engine_options, sort_keys=True, default=repr))
+    engine = _ENGINE_REGISTRY.get(key)
+    if engine is None:
+        with _ENGINE_REGISTRY_LOCK:
+            engine = _ENGINE_REGISTRY.get(key)
+            if engine is None:
+                engine = ProofSenseEngine(domain, **engine_options)
+                _ENGINE_REGISTRY[key] = engine
+    return engine
+
+def invalidate_engines(domain: Optional[str] = None) -> int:
+    """Drop shared engines for one domain (or all); returns how many were dropped"""
+    with _ENGINE_REGISTRY_LOCK:
+        stale = [key for key in _ENGINE_REGISTRY if domain is None or key[0] == domain]
+        for key in stale:
+            del _ENGINE_REGISTRY[key]
+    return len(stale)
 
 # CLI interface for quick testing
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+"""
+ProofSense AI - Hashed Dense Retrieval
+Offline vector retrieval: feature-hashed word + character n-gram vectors, no model download
+
+Every text becomes a fixed-width, L2-normalized vector via the hashing trick
+(signed crc32 buckets), so claims and evidence live in the same space without
+a vocabulary or a trained model. Evidence vectors sit in one contiguous
+float32 matrix (or int8 with per-row scales), and a batch of claims is
+scored with a single matmul per chunk plus argpartition.
+"""
+
+import functools
+import inspect
+import zlib
+from typing import Dict, List, Optional, Tuple, Sequence
+import numpy as np
+
+from proofsense_index import tokenize
+
+# Distinct words whose hashed features are kept; query-time vocabulary is unbounded
+FEATURE_CACHE_SIZE = 1 << 16
+
+
+@functools.lru_cache(maxsize=FEATURE_CACHE_SIZE)
+def _word_features(word: str, dim: int, char_ngram: int,
+                   char_ngram_weight: float) -> Tuple[Tuple[int, ...], Tuple[float, ...]]:
+    """Hashed (bucket, signed weight) features of one word and its char n-grams"""
+    padded = f"<{word}>"
+    features = [(word, 1.0)]
+    features.extend(
+        (padded[i:i + char_ngram], char_ngram_weight)
+        for i in range(len(padded) - char_ngram + 1)
+    )
+    buckets = []
+    weights = []
+    for feature, weight in features:
+        hashed = zlib.crc32(feature.encode("utf-8"))
+        buckets.append(hashed % dim)
+        weights.append(weight if hashed & 0x80000000 else -weight)
+    return tuple(buckets), tuple(weights)
+
+
+class HashedDenseIndex:
+    """Feature-hashed dense vectors for every evidence sentence
+
+    ``shortlist`` is how many nearest vectors each claim keeps; with
+    ``rerank`` the engine re-scores that shortlist with its exact scorer,
+    otherwise the cosine similarities are used as evidence scores directly.
+    ``quantize`` stores int8 vectors (4x smaller) that are dequantized one
+    chunk at a time during search.
+    """
+
+    # Constructor parameters that shape the built arrays; engine snapshots are keyed on them
+    BUILD_PARAMETERS = ("dim", "char_ngram", "char_ngram_weight", "quantize")
+
+    def __init__(self, texts: Sequence[str], dim: int = 1024, char_ngram: int = 3,
+                 char_ngram_weight: float = 0.5, quantize: bool = False, shortlist: int = 32,
+                 rerank: bool = True, chunk_size: int = 16384, snapshot: Optional[Dict[str, np.ndarray]] = None):
+        self.dim = dim
+        self.char_ngram = char_ngram
+        self.char_ngram_weight = char_ngram_weight
+        self.quantize = quantize
+        self.shortlist = shortlist
+        self.rerank = rerank
+        self.chunk_size = chunk_size
+
+        # Arrays saved by snapshot_arrays(); anything not shaped for these parameters is re-encoded
+        self.from_snapshot = snapshot is not None and self._snapshot_fits(snapshot, len(texts))
+        if self.from_snapshot:
+            self.vectors = snapshot["dense_vectors"]
+            self.scales = snapshot.get("dense_scales")
+            return
+
+        num_evidence = len(texts)
+        if quantize:
+            self.vectors = np.zeros((num_evidence, dim), dtype=np.int8)
+            self.scales = np.zeros(num_evidence, dtype=np.float32)
+        else:
+            self.vectors = np.zeros((num_evidence, dim), dtype=np.float32)
+            self.scales = None
+
+        for start in range(0, num_evidence, chunk_size):
+            stop = min(start + chunk_size, num_evidence)
+            encoded = self.encode([texts[i] for i in range(start, stop)])
+            if quantize:
+                peak = np.abs(encoded).max(axis=1)
+                peak[peak == 0] = 1.0
+                self.scales[start:stop] = peak / 127
+                self.vectors[start:stop] = np.rint(encoded / self.scales[start:stop, None]).astype(np.int8)
+            else:
+                self.vectors[start:stop] = encoded
+
+    @classmethod
+    def build_config(cls, **options) -> Dict:
+        """BUILD_PARAMETERS for the given constructor options, with defaults filled in"""
+        parameters = inspect.signature(cls).parameters
+        return {name: options.get(name, parameters[name].default) for name in cls.BUILD_PARAMETERS}
+
+    def config(self) -> Dict:
+        """BUILD_PARAMETERS this index was built with"""
+        return {name: getattr(self, name) for name in self.BUILD_PARAMETERS}
+
+    def _snapshot_fits(self, snapshot: Dict[str, np.ndarray], num_evidence: int) -> bool:
+        vectors = snapshot.get("dense_vectors")
+        if vectors is None or vectors.shape != (num_evidence, self.dim):
+            return False
+        if not self.quantize:
+            return vectors.dtype == np.float32 and "dense_scales" not in snapshot
+        scales = snapshot.get("dense_scales")
+        return vectors.dtype == np.int8 and scales is not None and scales.shape == (num_evidence,)
+
+    def snapshot_arrays(self) -> Dict[str, np.ndarray]:
+        """Built arrays to persist, accepted back through ``snapshot=``"""
+        arrays = {"dense_vectors": self.vectors}
+        if self.scales is not None:
+            arrays["dense_scales"] = self.scales
+        return arrays
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """L2-normalized float32 vectors, one row per text"""
+        rows = []
+        buckets = []
+        weights = []
+        for row, text in enumerate(texts):
+            for word in tokenize(text):
+                # Words repeat far more often than they are new; features come from a bounded LRU
+                word_buckets, word_weights = _word_features(word, self.dim, self.char_ngram, self.char_ngram_weight)
+                rows.extend([row] * len(word_buckets))
+                buckets.extend(word_buckets)
+                weights.extend(word_weights)
+
+        # Sum colliding features per (row, bucket) cell, then scatter into the dense matrix
+        flat = np.asarray(rows, dtype=np.int64) * self.dim + np.asarray(buckets, dtype=np.int64)
+        cells, inverse = np.unique(flat, return_inverse=True)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        vectors.ravel()[cells] = np.bincount(inverse, weights=weights, minlength=len(cells))
+        norms = np.linalg.norm(vectors, axis=1)
+        norms[norms == 0] = 1.0
+        return vectors / norms[:, None]
+
+    def search_batch(self, claims: List[str], top_k: int) -> List[List[Tuple[int, float]]]:
+        """Nearest (evidence id, cosine) pairs for every claim, best first, ties broken by evidence id"""
+        num_evidence = len(self.vectors)
+        if not claims or num_evidence == 0 or top_k <= 0:
+            return [[] for _ in claims]
+
+        queries = self.encode(claims)
+        best_ids = np.zeros((len(claims), 0), dtype=np.int64)
+        best_scores = np.zeros((len(claims), 0), dtype=np.float32)
+
+        # One matmul per chunk; only each chunk's top_k survive into the running pool
+        for start in range(0, num_evidence, self.chunk_size):
+            chunk = self.vectors[start:start + self.chunk_size]
+            if self.quantize:
+                chunk = chunk.astype(np.float32) * self.scales[start:start + self.chunk_size, None]
+            scores = np.minimum(queries @ chunk.T, 1.0)
+
+            if scores.shape[1] > top_k:
+                keep = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+                # argpartition picks arbitrarily among scores tied with the k-th best; where such
+                # a tie straddles the cut, keep everything above it plus the lowest tied ids
+                kth = np.take_along_axis(scores, keep, axis=1).min(axis=1, keepdims=True)
+                straddling = np.flatnonzero((scores >= kth).sum(axis=1) > top_k)
+                if len(straddling):
+                    rows, kth = scores[straddling], kth[straddling]
+                    above = rows > kth
+                    tied = rows == kth
+                    tied &= np.cumsum(tied, axis=1) <= top_k - above.sum(axis=1, keepdims=True)
+                    keep[straddling] = np.nonzero(above | tied)[1].reshape(len(straddling), top_k)
+                scores = np.take_along_axis(scores, keep, axis=1)
+            else:
+                keep = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+            best_ids = np.concatenate([best_ids, keep + start], axis=1)
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+
+        results = []
+        for ids, scores in zip(best_ids, best_scores):
+            order = np.lexsort((ids, -scores))[:top_k]
+            results.append(list(zip(ids[order].tolist(), scores[order].astype(np.float64).tolist())))
+        return results
@@ -0,0 +1,304 @@
+"""
+ProofSense AI - Evidence Index
+Interned, sparse token matrices over the evidence store for fast retrieval
+"""
+
+import heapq
+from typing import List, Dict, Tuple, Iterable, Iterator
+import numpy as np
+
+# Posting entries expanded per vectorized batch pass (bounds peak memory to tens of MB)
+MAX_BATCH_POSTINGS = 1 << 19
+
+# Claims expanding more postings than this skip the vectorized pass for the pruned top_k search
+PRUNED_SEARCH_POSTINGS = 1 << 16
+
+# Words ignored when comparing claims against evidence
+STOP_WORDS = frozenset({'the', 'a', 'an', 'in', 'on', 'at', 'to', 'for', 'of', 'is', 'are', 'was', 'were'})
+
+def tokenize(text: str) -> frozenset:
+    """Normalize text into its set of lowercase, non-stopword tokens"""
+    return frozenset(text.lower().split()) - STOP_WORDS
+
+def jaccard_similarity(claim_words: frozenset, evidence_words: frozenset) -> float:
+    """Jaccard overlap between two pre-tokenized word sets"""
+    if not claim_words or not evidence_words:
+        return 0.0
+    
+    intersection = claim_words & evidence_words
+    union = claim_words | evidence_words
+    
+    return len(intersection) / len(union) if union else 0.0
+
+
+def ragged_ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Concatenate arange(start, start + count) for every (start, count) pair"""
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    group_offsets = np.cumsum(counts) - counts
+    return np.arange(total, dtype=np.int64) - np.repeat(group_offsets, counts) + np.repeat(starts, counts)
+
+
+class EvidenceIndex:
+    """Sparse binary token matrix over pre-tokenized evidence sentences
+
+    Rows are stored CSR-style (evidence -> sorted token ids) and the same
+    matrix is kept transposed as posting lists (token -> evidence ids).
+    Token ids follow the sorted order of the vocabulary, so any mapping
+    with ``get`` (a dict, or a memory-mapped sorted word list) can serve
+    as the vocabulary.
+    """
+
+    def __init__(self, vocabulary, indptr: np.ndarray, indices: np.ndarray, lengths: np.ndarray,
+                 postings: np.ndarray, postings_indptr: np.ndarray, document_frequency: np.ndarray):
+        self.vocabulary = vocabulary
+
+        # Evidence rows (CSR)
+        self.indptr = indptr
+        self.indices = indices
+        self.lengths = lengths
+
+        # Posting lists (CSC), evidence ids ascending within each token
+        self.postings = postings
+        self.postings_indptr = postings_indptr
+        self.document_frequency = document_frequency
+
+    @classmethod
+    def from_tokens(cls, evidence_tokens: List[frozenset]) -> "EvidenceIndex":
+        """Build the index from pre-tokenized evidence sentences"""
+        words = sorted(set().union(*evidence_tokens)) if evidence_tokens else []
+        vocabulary: Dict[str, int] = {word: token_id for token_id, word in enumerate(words)}
+
+        indices = []
+        indptr = [0]
+        for evidence_words in evidence_tokens:
+            indices.extend(sorted(vocabulary[word] for word in evidence_words))
+            indptr.append(len(indices))
+
+        return cls.from_rows(vocabulary, np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int32))
+
+    @classmethod
+    def from_rows(cls, vocabulary, indptr: np.ndarray, indices: np.ndarray) -> "EvidenceIndex":
+        """Derive lengths and posting lists from CSR evidence rows"""
+        lengths = np.diff(indptr).astype(np.int32)
+        rows = np.repeat(np.arange(len(lengths), dtype=np.int32), lengths)
+        order = np.argsort(indices, kind="stable")
+        document_frequency = np.bincount(indices, minlength=len(vocabulary)).astype(np.int32)
+        postings_indptr = np.concatenate(([0], np.cumsum(document_frequency))).astype(np.int64)
+        return cls(vocabulary, indptr, indices, lengths, rows[order], postings_indptr, document_frequency)
+
+    @property
+    def num_evidence(self) -> int:
+        return len(self.lengths)
+
+    def words(self) -> Iterator[str]:
+        """Vocabulary words in token id order"""
+        return iter(self.vocabulary)
+
+    def token_ids(self, words: frozenset) -> np.ndarray:
+        """Ids of the words present in the vocabulary (unknown words are dropped)"""
+        token_ids = (self.vocabulary.get(word) for word in words)
+        return np.asarray([token_id for token_id in token_ids if token_id is not None], dtype=np.int64)
+
+    def candidates(self, words: frozenset) -> np.ndarray:
+        """Ascending ids of evidence sharing at least one token with the words"""
+        token_ids = self.token_ids(words)
+        starts = self.postings_indptr[token_ids]
+        counts = self.postings_indptr[token_ids + 1] - starts
+        return np.unique(self.postings[ragged_ranges(starts, counts)])
+
+    def top_k(self, words: frozenset, top_k: int = 3, threshold: float = 0.1) -> List[Tuple[int, float]]:
+        """Exact top-k (evidence id, score) pairs with Jaccard above threshold
+
+        AllPairs/PPJoin-style search: claim tokens are probed rarest first and
+        probing stops once evidence that missed every probed token can no
+        longer beat the threshold or the current k-th best score. Evidence
+        whose size and first-seen position bound its score below that cut-off
+        is never scored, and the running top-k lives in a bounded heap.
+        Results (including ties, broken by evidence id) are identical to
+        scoring every evidence sentence and sorting.
+        """
+        claim_size = len(words)
+        if claim_size == 0 or top_k <= 0:
+            return []
+
+        claim_ids = self.token_ids(words)
+        claim_id_set = set(claim_ids.tolist())
+
+        # Unknown words come first: they have no postings but still count toward |A|
+        probed = claim_size - len(claim_ids)
+        probe_order = claim_ids[np.argsort(self.document_frequency[claim_ids], kind="stable")].tolist()
+
+        # Min-heap of (score, -evidence id): the root is the current k-th best
+        heap = []
+        seen = np.zeros(self.num_evidence, dtype=bool)
+        for token_id in probe_order:
+            cutoff = heap[0][0] if len(heap) == top_k else threshold
+
+            # Evidence missing all probed tokens shares at most the remaining ones
+            remaining = claim_size - probed
+            remaining_bound = remaining / claim_size
+            if remaining_bound <= threshold or remaining_bound < cutoff:
+                break
+            probed += 1
+
+            postings = self.postings[self.postings_indptr[token_id]:self.postings_indptr[token_id + 1]]
+            postings = postings[~seen[postings]]
+            seen[postings] = True
+
+            # Size/position filter: evidence first met here shares at most min(remaining, |B|) tokens
+            sizes = self.lengths[postings]
+            max_overlap = np.minimum(remaining, sizes)
+            bound = max_overlap / (claim_size + sizes - max_overlap)
+            keep = (bound > threshold) & (bound >= cutoff)
+
+            self._push_scores(heap, top_k, threshold, claim_id_set, claim_size,
+                              postings[keep].tolist(), sizes[keep].tolist())
+
+        return [(-negative_id, score) for score, negative_id in sorted(heap, reverse=True)]
+
+    def rerank(self, words: frozenset, evidence_ids: Iterable[int], top_k: int = 3,
+               threshold: float = 0.1) -> List[Tuple[int, float]]:
+        """Exact top-k among given candidates (e.g. from an approximate search)"""
+        claim_size = len(words)
+        if claim_size == 0 or top_k <= 0:
+            return []
+
+        evidence_ids = list(evidence_ids)
+        heap = []
+        self._push_scores(heap, top_k, threshold, set(self.token_ids(words).tolist()), claim_size,
+                          evidence_ids, self.lengths[evidence_ids].tolist())
+        return [(-negative_id, score) for score, negative_id in sorted(heap, reverse=True)]
+
+    def _push_scores(self, heap: List[Tuple[float, int]], top_k: int, threshold: float, claim_id_set: set,
+                     claim_size: int, evidence_ids: List[int], evidence_sizes: List[int]) -> None:
+        """Score evidence exactly, keeping the best top_k as (score, -id) in a min-heap"""
+        for evidence_id, evidence_size in zip(evidence_ids, evidence_sizes):
+            row = self.indices[self.indptr[evidence_id]:self.indptr[evidence_id + 1]].tolist()
+            overlap = len(claim_id_set.intersection(row))
+            score = overlap / (claim_size + evidence_size - overlap)
+            if score <= threshold:
+                continue
+
+            entry = (score, -evidence_id)
+            if len(heap) < top_k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+    def claim_expansions(self, claim_ids: List[np.ndarray]) -> np.ndarray:
+        """Posting entries a vectorized pass would expand for each claim (sum of its token frequencies)"""
+        return np.asarray([int(self.document_frequency[ids].sum()) for ids in claim_ids], dtype=np.int64)
+
+    def _batch_chunks(self, expansions: np.ndarray, claims: List[int], max_postings: int) -> Iterator[List[int]]:
+        """Consecutive groups of claims whose expansions together stay within max_postings"""
+        chunk, total = [], 0
+        for claim in claims:
+            if chunk and total + expansions[claim] > max_postings:
+                yield chunk
+                chunk, total = [], 0
+            chunk.append(claim)
+            total += int(expansions[claim])
+        if chunk:
+            yield chunk
+
+    def _jaccard_pass(self, claim_ids: List[np.ndarray], claim_lengths: np.ndarray,
+                      threshold: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sparse Jaccard entries for one bounded group of claims (rows local to the group)"""
+        num_evidence = self.num_evidence
+
+        # Expand every claim token into its posting list, tagged with the claim row
+        token_ids = np.concatenate(claim_ids)
+        token_rows = np.repeat(np.arange(len(claim_ids), dtype=np.int64), [len(ids) for ids in claim_ids])
+        starts = self.postings_indptr[token_ids]
+        counts = self.postings_indptr[token_ids + 1] - starts
+        evidence_ids = self.postings[ragged_ranges(starts, counts)].astype(np.int64)
+        evidence_rows = np.repeat(token_rows, counts)
+
+        # Size filter: J(A, B) <= min(|A|, |B|) / max(|A|, |B|), so hopeless pairs never reach np.unique
+        if threshold > 0:
+            sizes = self.lengths[evidence_ids]
+            claim_sizes = claim_lengths[evidence_rows]
+            keep = np.minimum(sizes, claim_sizes) > threshold * np.maximum(sizes, claim_sizes)
+            evidence_ids, evidence_rows = evidence_ids[keep], evidence_rows[keep]
+
+        # |A & B| for every (claim, evidence) pair that shares a token
+        keys, intersection = np.unique(evidence_rows * num_evidence + evidence_ids, return_counts=True)
+        rows = keys // num_evidence
+        cols = keys % num_evidence
+
+        # |A | B| = |A| + |B| - |A & B|
+        union = claim_lengths[rows] + self.lengths[cols] - intersection
+        return rows, cols, intersection / union
+
+    def jaccard_batch(self, claim_tokens: List[frozenset], threshold: float = 0.0,
+                      max_postings: int = MAX_BATCH_POSTINGS) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Claims x evidence Jaccard matrix, vectorized in passes of bounded size
+
+        Returns the non-zero entries as (claim rows, evidence ids, scores),
+        sorted by claim row and then evidence id. Each pass expands at most
+        ``max_postings`` posting entries (a single claim may exceed it on its
+        own); with a ``threshold``, pairs whose sizes alone keep them at or
+        below it are skipped, so only the output can grow with the input.
+        """
+        claim_ids = [self.token_ids(words) for words in claim_tokens]
+        claim_lengths = np.asarray([len(words) for words in claim_tokens], dtype=np.int64)
+        empty = np.zeros(0, dtype=np.int64)
+        if not claim_ids or self.num_evidence == 0:
+            return empty, empty, np.zeros(0, dtype=np.float64)
+
+        parts = []
+        expansions = self.claim_expansions(claim_ids)
+        for chunk in self._batch_chunks(expansions, list(range(len(claim_ids))), max_postings):
+            rows, cols, scores = self._jaccard_pass([claim_ids[i] for i in chunk], claim_lengths[chunk], threshold)
+            parts.append((rows + chunk[0], cols, scores))
+        return tuple(np.concatenate(part) for part in zip(*parts))
+
+    def top_k_batch(self, claim_tokens: List[frozenset], top_k: int = 3, threshold: float = 0.1,
+                    max_postings: int = MAX_BATCH_POSTINGS) -> List[List[Tuple[int, float]]]:
+        """Best (evidence id, score) pairs above threshold for every claim
+
+        Claims whose tokens are rare enough are scored together in vectorized
+        passes of at most ``max_postings`` expanded postings; claims whose
+        tokens are common (more than PRUNED_SEARCH_POSTINGS postings) use the
+        pruned top_k search instead, which never expands them in full. Both
+        give the same results, with ties broken by evidence id, matching a
+        stable sort over the knowledge base in its original order.
+        """
+        results: List[List[Tuple[int, float]]] = [[] for _ in claim_tokens]
+        if top_k <= 0 or self.num_evidence == 0:
+            return results
+
+        claim_ids = [self.token_ids(words) for words in claim_tokens]
+        claim_lengths = np.asarray([len(words) for words in claim_tokens], dtype=np.int64)
+        expansions = self.claim_expansions(claim_ids)
+
+        light = []
+        for i, words in enumerate(claim_tokens):
+            if expansions[i] > PRUNED_SEARCH_POSTINGS:
+                results[i] = self.top_k(words, top_k, threshold)
+            elif len(claim_ids[i]):
+                light.append(i)
+
+        for chunk in self._batch_chunks(expansions, light, max_postings):
+            rows, cols, scores = self._jaccard_pass([claim_ids[i] for i in chunk], claim_lengths[chunk], threshold)
+
+            keep = scores > threshold
+            rows, cols, scores = rows[keep], cols[keep], scores[keep]
+
+            # Order by claim, then score descending, then evidence id
+            order = np.lexsort((cols, -scores, rows))
+            rows, cols, scores = rows[order], cols[order], scores[order]
+
+            # Rank within each claim's group and cut to top_k
+            rank = np.arange(len(rows)) - np.searchsorted(rows, rows, side="left")
+            keep = rank < top_k
+            rows, cols, scores = rows[keep], cols[keep], scores[keep]
+
+            bounds = np.searchsorted(rows, np.arange(len(chunk) + 1), side="left")
+            cols, scores = cols.tolist(), scores.tolist()
+            for claim, begin, end in zip(chunk, bounds[:-1], bounds[1:]):
+                results[claim] = list(zip(cols[begin:end], scores[begin:end]))
+        return results
@@ -0,0 +1,377 @@
+"""
+ProofSense AI - Streaming Ingestion
+Build or extend per-domain evidence stores from large JSONL/CSV files in bounded memory
+
+Records are read one at a time, tokenized in chunks and spilled to disk, so
+peak memory is one chunk plus the vocabulary. The final pass remaps token ids
+to sorted vocabulary order and fills the posting lists chunk by chunk
+(counting sort), writing straight into memory-mapped scratch files.
+
+Usage:
+    python proofsense_ingest.py evidence.jsonl more.csv --output-dir stores/
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from proofsense_index import tokenize
+from proofsense_store import (ContentHasher, EvidenceStore, encode_strings, open_evidence_store,
+                              write_store_sections)
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Spill file -> dtype
+SPILL_FILES = {
+    "text_blob": np.uint8,
+    "text_lengths": np.int64,
+    "source_blob": np.uint8,
+    "source_lengths": np.int64,
+    "indices": np.int32,
+    "lengths": np.int32,
+}
+
+
+def _iter_rows(path: str, f) -> Iterator[Tuple[int, object]]:
+    """(line number, parsed row) pairs of a .jsonl or .csv file"""
+    if path.lower().endswith(".csv"):
+        rows = csv.DictReader(f)
+        for row in rows:
+            yield rows.line_num, row
+        return
+
+    for line_no, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"{path}:{line_no}: invalid JSON ({error.msg})") from None
+
+
+def iter_evidence_records(path: str, default_domain: str = "general") -> Iterator[Dict[str, str]]:
+    """Stream {text, domain, source_id} records from a .jsonl or .csv file
+
+    Records without text are skipped; malformed ones raise ValueError naming
+    the file and line.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        for line_no, row in _iter_rows(path, f):
+            if not isinstance(row, dict):
+                raise ValueError(f"{path}:{line_no}: expected an object, got {type(row).__name__}")
+            text, domain, source_id = row.get("text"), row.get("domain"), row.get("source_id")
+            if text is not None and not isinstance(text, str):
+                raise ValueError(f"{path}:{line_no}: 'text' must be a string, got {type(text).__name__}")
+            if domain is not None and not isinstance(domain, str):
+                raise ValueError(f"{path}:{line_no}: 'domain' must be a string, got {type(domain).__name__}")
+            if source_id is not None and (isinstance(source_id, bool) or not isinstance(source_id, (str, int))):
+                raise ValueError(f"{path}:{line_no}: 'source_id' must be a string or integer")
+
+            text = (text or "").strip()
+            if not text:
+                continue
+            yield {
+                "text": text,
+                "domain": domain or default_domain,
+                "source_id": "" if source_id is None else str(source_id),
+            }
+
+
+def source_key(source_id: str) -> int:
+    """64-bit key of a source id, for de-duplication without holding the ids in memory"""
+    return int.from_bytes(hashlib.blake2b(source_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class EvidenceStoreBuilder:
+    """Incrementally builds (or extends) one domain's evidence store"""
+
+    def __init__(self, path: str, base: Optional[EvidenceStore] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.vocabulary: Dict[str, int] = {}
+        self.num_evidence = 0
+        # Hashed as texts are spilled, so finalize can record it without re-reading them
+        self._content_hash = ContentHasher()
+        # Keys of the source ids already in the store: sorted for the base, a set for new records
+        self._base_sources = np.zeros(0, dtype=np.uint64)
+        self._new_sources = set()
+
+        self._spill_dir = tempfile.mkdtemp(prefix=".ingest-", dir=os.path.dirname(os.path.abspath(path)))
+        self._spills = {name: open(self._spill_path(name), "wb") for name in SPILL_FILES}
+
+        if base is not None:
+            self._extend_from(base)
+
+    def _spill_path(self, name: str) -> str:
+        return os.path.join(self._spill_dir, name)
+
+    def _spill(self, name: str, values) -> None:
+        self._spills[name].write(np.asarray(values, dtype=SPILL_FILES[name]).tobytes())
+
+    def _map(self, name: str, dtype, count: Optional[int] = None, mode: str = "r") -> np.ndarray:
+        """Memory-map a scratch file (np.memmap cannot map zero-length files)"""
+        if count is None:
+            count = os.path.getsize(self._spill_path(name)) // np.dtype(dtype).itemsize
+        if count == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(self._spill_path(name), dtype=dtype, mode=mode, shape=(count,))
+
+    def add(self, texts: List[str], source_ids: Optional[List[str]] = None) -> None:
+        """Tokenize one chunk of evidence and spill it to disk"""
+        if source_ids is None:
+            source_ids = [""] * len(texts)
+
+        indices = []
+        lengths = []
+        for text in texts:
+            row = [self.vocabulary.setdefault(word, len(self.vocabulary)) for word in tokenize(text)]
+            indices.extend(row)
+            lengths.append(len(row))
+
+        encoded_texts = [text.encode("utf-8") for text in texts]
+        encoded_sources = [source_id.encode("utf-8") for source_id in source_ids]
+        text_blob = b"".join(encoded_texts)
+        text_lengths = [len(data) for data in encoded_texts]
+        self._spills["text_blob"].write(text_blob)
+        self._spill("text_lengths", text_lengths)
+        self._content_hash.update(np.frombuffer(text_blob, dtype=np.uint8), text_lengths)
+        self._spills["source_blob"].write(b"".join(encoded_sources))
+        self._spill("source_lengths", [len(data) for data in encoded_sources])
+        self._spill("indices", indices)
+        self._spill("lengths", lengths)
+        self.num_evidence += len(texts)
+
+    def _extend_from(self, base: EvidenceStore) -> None:
+        """Seed the builder with an existing store, copying it chunk by chunk"""
+        # Seeding in token id order keeps the base's token ids valid as provisional ids
+        for word in base.index.words():
+            self.vocabulary[word] = len(self.vocabulary)
+
+        index = base.index
+        text_offsets = base.texts.offsets
+        for start in range(0, index.num_evidence, self.chunk_size):
+            stop = min(start + self.chunk_size, index.num_evidence)
+            text_blob = base.texts.blob[text_offsets[start]:text_offsets[stop]]
+            text_lengths = np.diff(text_offsets[start:stop + 1])
+            self._spills["text_blob"].write(text_blob.tobytes())
+            self._spill("text_lengths", text_lengths)
+            self._content_hash.update(text_blob, text_lengths)
+            if base.source_ids is not None:
+                source_offsets = base.source_ids.offsets
+                keys = [source_key(base.source_ids[i]) for i in range(start, stop) if base.source_ids[i]]
+                self._base_sources = np.concatenate([self._base_sources, np.array(keys, dtype=np.uint64)])
+                self._spills["source_blob"].write(base.source_ids.blob[source_offsets[start]:source_offsets[stop]].tobytes())
+                self._spill("source_lengths", np.diff(source_offsets[start:stop + 1]))
+            else:
+                self._spill("source_lengths", np.zeros(stop - start))
+            self._spill("indices", index.indices[index.indptr[start]:index.indptr[stop]])
+            self._spill("lengths", index.lengths[start:stop])
+        self.num_evidence = index.num_evidence
+        self._base_sources.sort()
+
+    def claim_source(self, source_id: str) -> bool:
+        """Record a source id; False if the store (or this run) already has it"""
+        key = source_key(source_id)
+        position = np.searchsorted(self._base_sources, np.uint64(key))
+        if position < len(self._base_sources) and self._base_sources[position] == key:
+            return False
+        if key in self._new_sources:
+            return False
+        self._new_sources.add(key)
+        return True
+
+    def _offsets(self, lengths_name: str, name: str) -> np.ndarray:
+        """Running n + 1 offsets of a spilled lengths file, written to a scratch file"""
+        lengths = self._map(lengths_name, SPILL_FILES[lengths_name])
+        offsets = self._map(name, np.int64, count=len(lengths) + 1, mode="w+")
+        offsets[0] = 0
+        total = 0
+        for start in range(0, len(lengths), self.chunk_size):
+            chunk = np.cumsum(lengths[start:start + self.chunk_size], dtype=np.int64) + total
+            offsets[start + 1:start + 1 + len(chunk)] = chunk
+            total = int(chunk[-1])
+        return offsets
+
+    def finalize(self, metadata: Optional[Dict] = None) -> EvidenceStore:
+        """Write the finished store atomically and return it opened, with its content hash in the metadata"""
+        metadata = {**(metadata or {}), "content_hash": self._content_hash.hexdigest()}
+        for spill in self._spills.values():
+            spill.close()
+
+        # Provisional (first-seen) ids -> ids in sorted vocabulary order
+        words = sorted(self.vocabulary)
+        remap = np.empty(len(words), dtype=np.int32)
+        remap[np.fromiter((self.vocabulary[word] for word in words), dtype=np.int64, count=len(words))] = \
+            np.arange(len(words), dtype=np.int32)
+
+        lengths = self._map("lengths", np.int32)
+        indptr = self._offsets("lengths", "indptr")
+        provisional = self._map("indices", np.int32)
+        indices = self._map("sorted_indices", np.int32, count=len(provisional), mode="w+")
+        document_frequency = np.zeros(len(words), dtype=np.int64)
+
+        # Pass 1: remap and sort every row, counting document frequencies
+        for start in range(0, self.num_evidence, self.chunk_size):
+            stop = min(start + self.chunk_size, self.num_evidence)
+            low, high = indptr[start], indptr[stop]
+            token_ids = remap[provisional[low:high]]
+            rows = np.repeat(np.arange(start, stop), lengths[start:stop])
+            indices[low:high] = token_ids[np.lexsort((token_ids, rows))]
+            document_frequency += np.bincount(token_ids, minlength=len(words))
+
+        # Pass 2: counting-sort evidence ids into the posting lists; chunks arrive in
+        # ascending evidence order, so every posting list stays sorted
+        postings_indptr = np.concatenate(([0], np.cumsum(document_frequency))).astype(np.int64)
+        postings = self._map("postings", np.int32, count=len(indices), mode="w+")
+        cursor = postings_indptr[:-1].copy()
+        for start in range(0, self.num_evidence, self.chunk_size):
+            stop = min(start + self.chunk_size, self.num_evidence)
+            low, high = indptr[start], indptr[stop]
+            token_ids = np.asarray(indices[low:high])
+            rows = np.repeat(np.arange(start, stop, dtype=np.int32), lengths[start:stop])
+            order = np.argsort(token_ids, kind="stable")
+            sorted_ids = token_ids[order]
+            rank = np.arange(len(sorted_ids)) - np.searchsorted(sorted_ids, sorted_ids, side="left")
+            postings[cursor[sorted_ids] + rank] = rows[order]
+            cursor += np.bincount(token_ids, minlength=len(words))
+
+        vocab_blob, vocab_offsets = encode_strings(words)
+        arrays = {
+            "text_blob": self._map("text_blob", np.uint8),
+            "text_offsets": self._offsets("text_lengths", "text_offsets"),
+            "vocab_blob": vocab_blob,
+            "vocab_offsets": vocab_offsets,
+            "indptr": indptr,
+            "indices": indices,
+            "lengths": lengths,
+            "postings": postings,
+            "postings_indptr": postings_indptr,
+            "document_frequency": document_frequency.astype(np.int32),
+            "source_blob": self._map("source_blob", np.uint8),
+            "source_offsets": self._offsets("source_lengths", "source_offsets"),
+        }
+
+        # Write beside the target and swap in, so open readers keep their old mapping
+        temporary_path = self.path + ".tmp"
+        write_store_sections(temporary_path, arrays, metadata)
+        del arrays, lengths, indptr, provisional, indices, postings
+        os.replace(temporary_path, self.path)
+        shutil.rmtree(self._spill_dir, ignore_errors=True)
+
+        return open_evidence_store(self.path)
+
+    def discard(self) -> None:
+        """Close and delete the scratch files and any partly written store (safe to call twice)"""
+        for spill in self._spills.values():
+            spill.close()
+        shutil.rmtree(self._spill_dir, ignore_errors=True)
+        if os.path.exists(self.path + ".tmp"):
+            os.remove(self.path + ".tmp")
+
+
+@dataclass
+class IngestReport:
+    """Progress and throughput of an ingestion run"""
+    records: int = 0
+    duplicates: int = 0
+    domains: Dict[str, int] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def ingest_evidence(paths: Iterable[str], output_dir: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    extend: bool = True, default_domain: str = "general",
+                    progress: Optional[Callable[[IngestReport], None]] = None) -> IngestReport:
+    """Stream evidence records into one store per domain (``<output_dir>/<domain>.pse``)
+
+    With ``extend``, records are appended to any existing store for their
+    domain; records whose ``source_id`` the store (or this run) already has
+    are skipped and counted in ``duplicates``, so re-ingesting a feed does
+    not grow the store. Records without a source id are always added.
+    ``progress`` is called with the running report after every chunk.
+    If anything fails, scratch files are removed and stores not yet
+    finalized keep their previous contents.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    report = IngestReport()
+    builders: Dict[str, EvidenceStoreBuilder] = {}
+    buffers: Dict[str, List[Dict[str, str]]] = {}
+    started = time.perf_counter()
+
+    def flush(domain: str) -> None:
+        buffer = buffers[domain]
+        builders[domain].add([record["text"] for record in buffer], [record["source_id"] for record in buffer])
+        buffer.clear()
+        report.elapsed = time.perf_counter() - started
+        if progress is not None:
+            progress(report)
+
+    try:
+        for path in paths:
+            for record in iter_evidence_records(path, default_domain):
+                domain = record["domain"]
+                if domain not in builders:
+                    if not re.fullmatch(r"[\w\-]+", domain):
+                        raise ValueError(f"Invalid domain name for an evidence store: {domain!r}")
+                    store_path = os.path.join(output_dir, f"{domain}.pse")
+                    base = open_evidence_store(store_path) if extend and os.path.exists(store_path) else None
+                    builders[domain] = EvidenceStoreBuilder(store_path, base, chunk_size)
+                    buffers[domain] = []
+
+                if record["source_id"] and not builders[domain].claim_source(record["source_id"]):
+                    report.duplicates += 1
+                    continue
+                buffers[domain].append(record)
+                report.records += 1
+                report.domains[domain] = report.domains.get(domain, 0) + 1
+                if len(buffers[domain]) >= chunk_size:
+                    flush(domain)
+
+        for domain, builder in builders.items():
+            if buffers[domain]:
+                flush(domain)
+            builder.finalize({"domain": domain})
+    finally:
+        # Finished builders have nothing left; failed runs must not leak spill dirs or handles
+        for builder in builders.values():
+            builder.discard()
+
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest evidence records into per-domain evidence stores")
+    parser.add_argument("paths", nargs="+", help="JSONL or CSV files with text, domain and source_id fields")
+    parser.add_argument("--output-dir", default="evidence_stores")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--replace", action="store_true", help="Rebuild stores instead of extending them")
+    args = parser.parse_args()
+
+    def print_progress(report: IngestReport) -> None:
+        print(f"  {report.records:,} records ({report.records_per_second:,.0f} records/sec)")
+
+    print("📥 ProofSense AI - Evidence Ingestion\n")
+    report = ingest_evidence(args.paths, args.output_dir, args.chunk_size, extend=not args.replace,
+                             progress=print_progress)
+
+    print(f"\nIngested {report.records:,} records in {report.elapsed:.1f}s "
+          f"({report.records_per_second:,.0f} records/sec)")
+    if report.duplicates:
+        print(f"Skipped {report.duplicates:,} records whose source_id was already stored")
+    for domain, count in sorted(report.domains.items()):
+        print(f"  {domain}: {count:,}")
@@ -0,0 +1,128 @@
+"""
+ProofSense AI - Language Checks
+Overconfident-language detection and claim-type classification, each one compiled pass
+"""
+
+import bisect
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# (pattern index, start offset, matched text)
+Match = Tuple[int, int, str]
+
+
+class PatternScanner:
+    """Many regex patterns folded into a single scan
+
+    Every pattern becomes a named alternative inside a zero-width lookahead,
+    so one scan visits each position once and still reports overlapping
+    matches of different patterns. The lookahead names the first pattern
+    matching at a position; later patterns are only tried individually at
+    those (rare) positions. When every pattern starts with a word boundary,
+    that check is hoisted out of the lookahead so most positions are
+    rejected before any alternative is tried.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = tuple(patterns)
+        prefix = r"\b" if self.patterns and all(p.startswith(r"\b") for p in self.patterns) else ""
+        alternatives = "|".join(
+            f"(?P<p{i}>{pattern[len(prefix):]})" for i, pattern in enumerate(self.patterns)
+        )
+        self._regex = re.compile(f"{prefix}(?=(?:{alternatives}))") if self.patterns else None
+        self._compiled = [re.compile(pattern) for pattern in self.patterns]
+
+    def scan(self, lowered: str) -> List[Match]:
+        """Every match in already-lowercased text, in text order"""
+        if self._regex is None:
+            return []
+        matches = []
+        for match in self._regex.finditer(lowered):
+            name = match.lastgroup
+            pattern_id, start = int(name[1:]), match.start(name)
+            matches.append((pattern_id, start, match.group(name)))
+            for later_id in range(pattern_id + 1, len(self.patterns)):
+                later = self._compiled[later_id].match(lowered, start)
+                if later is not None:
+                    matches.append((later_id, start, later.group()))
+        return matches
+
+    def scan_spans(self, text: str, spans: Sequence[Tuple[int, int]],
+                   lowered: Optional[str] = None) -> List[List[Match]]:
+        """Matches per (start, end) span of text from one scan of the whole text
+
+        Spans must be sorted and non-overlapping; a match counts for a span
+        when it lies entirely inside it.
+        """
+        lowered = text.lower() if lowered is None else lowered
+        if len(lowered) != len(text):
+            # Lowercasing changed offsets (rare Unicode cases): scan span by span
+            return [self.scan(text[start:end].lower()) for start, end in spans]
+
+        starts = [start for start, _ in spans]
+        per_span = [[] for _ in spans]
+        for pattern_id, offset, matched in self.scan(lowered):
+            i = bisect.bisect_right(starts, offset) - 1
+            if i >= 0 and offset + len(matched) <= spans[i][1]:
+                per_span[i].append((pattern_id, offset - spans[i][0], matched))
+        return per_span
+
+
+class OverconfidenceMatcher:
+    """Overconfident-language warnings, identical to one findall per pattern"""
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = tuple(patterns)
+        self._scanner = PatternScanner(self.patterns)
+
+    def _warnings(self, matches: List[Match]) -> List[str]:
+        # First match of each pattern, reported in pattern order
+        first = {}
+        for pattern_id, _, matched in matches:
+            first.setdefault(pattern_id, matched)
+        return [f"Overconfident language detected: '{first[i]}'" for i in sorted(first)]
+
+    def warnings(self, claim: str) -> List[str]:
+        """Warnings for one claim"""
+        return self._warnings(self._scanner.scan(claim.lower()))
+
+    def warnings_batch(self, text: str, spans: Sequence[Tuple[int, int]],
+                       lowered: Optional[str] = None) -> List[List[str]]:
+        """Warnings for every claim span of text, scanning the text once"""
+        return [self._warnings(matches) for matches in self._scanner.scan_spans(text, spans, lowered)]
+
+
+class ClaimTypeClassifier:
+    """Assigns each claim the highest-priority type whose pattern occurs in it
+
+    ``taxonomy`` is an ordered list of {"label", "description", "pattern"}
+    entries (see config.CLAIM_TYPES); the entry whose pattern is None is the
+    fallback. All type patterns are checked in the same single scan.
+    """
+
+    def __init__(self, taxonomy: Sequence[Dict]):
+        self.taxonomy = self.freeze(taxonomy)
+        typed = [(label, description, pattern) for label, description, pattern in self.taxonomy if pattern]
+        self._types = [(label, description) for label, description, _ in typed]
+        self._scanner = PatternScanner([pattern for _, _, pattern in typed])
+        self.default = next(((label, description) for label, description, pattern in self.taxonomy
+                             if not pattern), ("", ""))
+
+    @staticmethod
+    def freeze(taxonomy: Sequence[Dict]) -> Tuple[Tuple[str, str, Optional[str]], ...]:
+        """Hashable (label, description, pattern) form of a taxonomy"""
+        return tuple((t["label"], t["description"], t["pattern"]) for t in taxonomy)
+
+    def _classify(self, matches: List[Match]) -> Tuple[str, str]:
+        if not matches:
+            return self.default
+        return self._types[min(pattern_id for pattern_id, _, _ in matches)]
+
+    def classify(self, claim: str) -> Tuple[str, str]:
+        """(label, description) for one claim"""
+        return self._classify(self._scanner.scan(claim.lower()))
+
+    def classify_batch(self, text: str, spans: Sequence[Tuple[int, int]],
+                       lowered: Optional[str] = None) -> List[Tuple[str, str]]:
+        """(label, description) for every claim span of text, scanning the text once"""
+        return [self._classify(matches) for matches in self._scanner.scan_spans(text, spans, lowered)]
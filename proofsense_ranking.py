@@ -0,0 +1,175 @@
+"""
+ProofSense AI - Ranking Functions
+BM25 and TF-IDF evidence scoring over the inverted index, as alternatives to raw Jaccard
+
+Scores are normalized to [0, 1] against the best score the claim could reach,
+so the engine's similarity threshold and confidence formula apply unchanged.
+Claim words missing from the knowledge base keep their (high) IDF in the
+normalization, so specific but unsupported terms still lower the score.
+"""
+
+from typing import List, Tuple, Iterable, Optional
+import numpy as np
+
+from proofsense_index import EvidenceIndex, ragged_ranges
+
+
+class InvertedIndexScorer:
+    """Term-at-a-time scorer that accumulates postings with NumPy
+
+    Per-term and per-evidence statistics are precomputed once from the
+    index. With ``prune_df_ratio``, terms found in more than that fraction
+    of the evidence never add new candidates; they only add their weight to
+    evidence already reached through rarer terms, which skips their long
+    posting lists entirely.
+    """
+
+    name = "base"
+
+    def __init__(self, index: EvidenceIndex, prune_df_ratio: Optional[float] = None):
+        self.index = index
+        self.prune_df = None if prune_df_ratio is None else prune_df_ratio * index.num_evidence
+
+    def term_weights(self, token_ids: np.ndarray, evidence_ids: np.ndarray) -> np.ndarray:
+        """Contribution of each (token, evidence) posting to the evidence score"""
+        raise NotImplementedError
+
+    def claim_norm(self, token_ids: np.ndarray, num_unknown: int) -> float:
+        """Best score a claim with these tokens could reach (the normalizer)"""
+        raise NotImplementedError
+
+    def _postings(self, token_id: int) -> np.ndarray:
+        return self.index.postings[self.index.postings_indptr[token_id]:self.index.postings_indptr[token_id + 1]]
+
+    def _add_to_candidates(self, scores: np.ndarray, candidates: np.ndarray, token_ids: Iterable[int]) -> None:
+        """Add weights of the given terms to already-known candidates only"""
+        for token_id in token_ids:
+            postings = self._postings(token_id)
+            positions = np.searchsorted(postings, candidates)
+            hit = positions < len(postings)
+            hit[hit] = postings[positions[hit]] == candidates[hit]
+            scores[hit] += self.term_weights(np.full(int(hit.sum()), token_id), candidates[hit])
+
+    def scores(self, words: frozenset, candidates: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Normalized scores as (evidence ids, scores), ascending by evidence id
+
+        Without ``candidates`` every evidence sharing a term is scored; with
+        them only those ids are (e.g. to re-rank an approximate shortlist).
+        """
+        token_ids = self.index.token_ids(words)
+        norm = self.claim_norm(token_ids, len(words) - len(token_ids))
+        if len(token_ids) == 0 or norm <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+
+        if candidates is not None:
+            candidates = np.unique(np.asarray(candidates, dtype=np.int64))
+            scores = np.zeros(len(candidates), dtype=np.float64)
+            self._add_to_candidates(scores, candidates, token_ids.tolist())
+            return candidates, scores / norm
+
+        # Rare terms expand the candidate set; the rarest always does
+        document_frequency = self.index.document_frequency[token_ids]
+        expanding = np.ones(len(token_ids), dtype=bool)
+        if self.prune_df is not None:
+            expanding = document_frequency <= self.prune_df
+            expanding[np.argmin(document_frequency)] = True
+
+        expand_ids = token_ids[expanding]
+        starts = self.index.postings_indptr[expand_ids]
+        counts = self.index.postings_indptr[expand_ids + 1] - starts
+        evidence_ids = self.index.postings[ragged_ranges(starts, counts)].astype(np.int64)
+        weights = self.term_weights(np.repeat(expand_ids, counts), evidence_ids)
+
+        candidates, inverse = np.unique(evidence_ids, return_inverse=True)
+        scores = np.bincount(inverse, weights=weights, minlength=len(candidates))
+        self._add_to_candidates(scores, candidates, token_ids[~expanding].tolist())
+        return candidates, scores / norm
+
+    def top_k(self, words: frozenset, top_k: int = 3, threshold: float = 0.1,
+              candidates: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """Best (evidence id, score) pairs above threshold, ties broken by evidence id"""
+        if top_k <= 0:
+            return []
+
+        evidence_ids, scores = self.scores(words, candidates)
+        keep = scores > threshold
+        evidence_ids, scores = evidence_ids[keep], scores[keep]
+
+        # Partition down to everything tied with the k-th best, then order exactly
+        if len(scores) > top_k:
+            kth_best = np.partition(scores, len(scores) - top_k)[len(scores) - top_k]
+            keep = scores >= kth_best
+            evidence_ids, scores = evidence_ids[keep], scores[keep]
+
+        order = np.lexsort((evidence_ids, -scores))[:top_k]
+        return list(zip(evidence_ids[order].tolist(), scores[order].tolist()))
+
+    def rerank(self, words: frozenset, evidence_ids: Iterable[int], top_k: int = 3,
+               threshold: float = 0.1) -> List[Tuple[int, float]]:
+        """Top-k among given candidates (e.g. from an approximate search)"""
+        return self.top_k(words, top_k, threshold, candidates=np.fromiter(evidence_ids, dtype=np.int64))
+
+    def top_k_batch(self, claim_tokens: List[frozenset], top_k: int = 3,
+                    threshold: float = 0.1) -> List[List[Tuple[int, float]]]:
+        """top_k for every claim; each claim is already a vectorized accumulation"""
+        return [self.top_k(words, top_k, threshold) for words in claim_tokens]
+
+
+class BM25Scorer(InvertedIndexScorer):
+    """Okapi BM25 with binary term frequency (claims and evidence are token sets)"""
+
+    name = "bm25"
+
+    def __init__(self, index: EvidenceIndex, k1: float = 1.2, b: float = 0.75,
+                 prune_df_ratio: Optional[float] = None):
+        super().__init__(index, prune_df_ratio)
+        num_evidence = index.num_evidence
+        document_frequency = np.asarray(index.document_frequency, dtype=np.float64)
+        lengths = np.asarray(index.lengths, dtype=np.float64)
+        average_length = lengths.mean() if num_evidence and lengths.mean() > 0 else 1.0
+
+        # Non-negative IDF variant, so common terms never subtract
+        self.idf = np.log1p((num_evidence - document_frequency + 0.5) / (document_frequency + 0.5))
+        self.unknown_idf = float(np.log1p((num_evidence + 0.5) / 0.5))
+
+        # tf = 1: weight = idf * (k1 + 1) / (1 + k1 * (1 - b + b * |d| / avgdl))
+        self.evidence_factor = (k1 + 1) / (1 + k1 * (1 - b + b * lengths / average_length))
+        self.max_factor = (k1 + 1) / (1 + k1 * (1 - b))
+
+    def term_weights(self, token_ids: np.ndarray, evidence_ids: np.ndarray) -> np.ndarray:
+        return self.idf[token_ids] * self.evidence_factor[evidence_ids]
+
+    def claim_norm(self, token_ids: np.ndarray, num_unknown: int) -> float:
+        return float((self.idf[token_ids].sum() + num_unknown * self.unknown_idf) * self.max_factor)
+
+
+class TfidfScorer(InvertedIndexScorer):
+    """Cosine similarity between binary TF-IDF vectors"""
+
+    name = "tfidf"
+
+    def __init__(self, index: EvidenceIndex, prune_df_ratio: Optional[float] = None):
+        super().__init__(index, prune_df_ratio)
+        num_evidence = index.num_evidence
+        document_frequency = np.asarray(index.document_frequency, dtype=np.float64)
+
+        # Smoothed IDF; evidence vector norms come from one pass over the CSR rows
+        self.idf = np.log((1 + num_evidence) / (1 + document_frequency)) + 1
+        self.unknown_idf = float(np.log(1 + num_evidence) + 1)
+        rows = np.repeat(np.arange(num_evidence), index.lengths)
+        squared = np.bincount(rows, weights=self.idf[index.indices] ** 2, minlength=num_evidence)
+        self.evidence_norms = np.sqrt(squared)
+        self.evidence_norms[self.evidence_norms == 0] = 1.0
+
+    def term_weights(self, token_ids: np.ndarray, evidence_ids: np.ndarray) -> np.ndarray:
+        return self.idf[token_ids] ** 2 / self.evidence_norms[evidence_ids]
+
+    def claim_norm(self, token_ids: np.ndarray, num_unknown: int) -> float:
+        return float(np.sqrt((self.idf[token_ids] ** 2).sum() + num_unknown * self.unknown_idf ** 2))
+
+
+# Scorer name -> class, for ProofSenseEngine(scorer=...)
+SCORERS = {
+    BM25Scorer.name: BM25Scorer,
+    TfidfScorer.name: TfidfScorer,
+}
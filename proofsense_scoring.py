@@ -0,0 +1,71 @@
+"""
+ProofSense AI - Scoring Kernel
+Confidence scores and risk levels for many claims at once, driven by config
+
+The kernel works on a padded (claims x top-k) matrix of evidence similarity
+scores and computes every confidence score and risk level with array
+operations, using SCORING_WEIGHTS and RISK_THRESHOLDS from config.py.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from config import EVIDENCE_SETTINGS, RISK_THRESHOLDS, SCORING_WEIGHTS
+
+# Risk levels from strongest to weakest support; anything below the last threshold is "high"
+RISK_LEVELS = ("verified", "low", "medium")
+
+
+def pad_scores(evidence_lists: Sequence[Sequence[Tuple[str, float]]],
+               width: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Padded score matrix (best match first in each row) and per-claim evidence counts"""
+    counts = np.fromiter((len(evidence) for evidence in evidence_lists), dtype=np.int64,
+                         count=len(evidence_lists))
+    width = int(counts.max(initial=0)) if width is None else width
+    scores = np.zeros((len(evidence_lists), width), dtype=np.float64)
+    for row, evidence in enumerate(evidence_lists):
+        if evidence:
+            scores[row, :len(evidence)] = [score for _, score in evidence]
+    return scores, counts
+
+
+def risk_levels(confidence: np.ndarray, thresholds: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """Risk level for each confidence score"""
+    thresholds = RISK_THRESHOLDS if thresholds is None else thresholds
+    return np.select([confidence >= thresholds[level] for level in RISK_LEVELS], RISK_LEVELS, "high")
+
+
+def score_matrix(scores: np.ndarray, counts: np.ndarray, weights: Optional[Dict[str, float]] = None,
+                 thresholds: Optional[Dict[str, float]] = None,
+                 full_support: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Confidence scores (0-100) and risk levels for every row of a padded score matrix
+
+    Row i holds claim i's evidence scores, best first, padded with zeros past
+    ``counts[i]``. Claims without evidence score 0 and are always high risk.
+    ``full_support`` is the number of sources that earns the full source-count
+    weight (defaults to the configured top_k).
+    """
+    weights = SCORING_WEIGHTS if weights is None else weights
+    full_support = EVIDENCE_SETTINGS["top_k"] if full_support is None else full_support
+    has_evidence = counts > 0
+
+    best_match = scores[:, 0] if scores.shape[1] else np.zeros(len(counts))
+    source_count = np.minimum(counts / full_support, 1.0)
+    avg_quality = np.divide(scores.sum(axis=1), counts, out=np.zeros(len(counts)), where=has_evidence)
+
+    confidence = (
+        best_match * weights["best_match"] +
+        source_count * weights["source_count"] +
+        avg_quality * weights["avg_quality"]
+    ) * 100
+    confidence = np.where(has_evidence, confidence, 0.0)
+
+    levels = np.where(has_evidence, risk_levels(confidence, thresholds), "high")
+    return confidence, levels
+
+
+def score_evidence_lists(evidence_lists: Sequence[Sequence[Tuple[str, float]]],
+                         **options) -> List[Tuple[float, str]]:
+    """(confidence, risk level) per claim's ranked evidence list, in one kernel call"""
+    confidence, levels = score_matrix(*pad_scores(evidence_lists), **options)
+    return list(zip(confidence.tolist(), levels.tolist()))
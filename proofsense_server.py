@@ -0,0 +1,219 @@
+"""
+ProofSense AI - HTTP Service
+Standalone JSON API for POST /api/verify, without Streamlit
+
+Connections are kept alive (HTTP/1.1) and handled on their own threads,
+but verification itself runs behind a bounded queue: when the queue is
+full the server answers 503 at once instead of letting latency grow
+without bound. By default requests are micro-batched per domain (see
+proofsense_batching); with a zero batch window they go to a fixed pool of
+worker threads instead. Engines for every domain are built before the
+socket starts accepting requests.
+
+Usage:
+    python proofsense_server.py --port 8000 --batch-window 0.002 --max-batch 64
+    python proofsense_server.py --port 8000 --batch-window 0 --workers 8
+
+    curl -X POST localhost:8000/api/verify -d '{"text": "Water boils at 100 degrees Celsius.", "domain": "general"}'
+"""
+
+import argparse
+import json
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Sequence
+
+from config import ADVANCED, API_CONFIG, DOMAIN_CONFIG, UI_CONFIG
+from proofsense_batching import MicroBatcher
+from proofsense_core import ProofSenseEngine, get_engine
+
+# Largest request body accepted, in bytes
+MAX_BODY_BYTES = 1 << 20
+
+
+class VerificationQueue:
+    """Bounded queue of verification jobs served by a fixed set of worker threads"""
+
+    def __init__(self, workers: int, max_pending: int):
+        self._jobs: "queue.Queue" = queue.Queue(max_pending)
+        self._threads = [
+            threading.Thread(target=self._run, name=f"proofsense-verify-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __len__(self) -> int:
+        return self._jobs.qsize()
+
+    def submit(self, job: Callable[[], object]) -> Future:
+        """Queue a job; raises queue.Full when the queue is at capacity"""
+        future = Future()
+        self._jobs.put_nowait((future, job))
+        return future
+
+    def _run(self) -> None:
+        while True:
+            item = self._jobs.get()
+            if item is None:
+                return
+            future, job = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(job())
+            except BaseException as error:
+                future.set_exception(error)
+
+    def close(self) -> None:
+        """Let queued jobs finish, then stop the workers"""
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+
+
+class VerifyRequestHandler(BaseHTTPRequestHandler):
+    """POST /api/verify with {"text", "domain"}; GET /api/health for readiness"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "ProofSense/1.0"
+    # Headers and body are separate writes; with Nagle on, keep-alive clients wait out delayed ACKs
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self.close_connection = True
+            return self._send_json(411, {"error": "Content-Length required"})
+        if length < 0 or length > MAX_BODY_BYTES:
+            self.close_connection = True
+            return self._send_json(413, {"error": f"Body must be at most {MAX_BODY_BYTES} bytes"})
+        body = self.rfile.read(length)
+
+        if self.path != API_CONFIG["endpoint"]:
+            return self._send_json(404, {"error": f"Unknown endpoint {self.path}"})
+        try:
+            payload = json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return self._send_json(400, {"error": "Body must be JSON"})
+        if not isinstance(payload, dict) or not isinstance(payload.get("text"), str):
+            return self._send_json(400, {"error": "'text' must be a string"})
+
+        domain = payload.get("domain", UI_CONFIG["default_domain"])
+        if not isinstance(domain, str):
+            return self._send_json(400, {"error": "'domain' must be a string",
+                                         "domains": sorted(self.server.engines)})
+        engine = self.server.engines.get(domain)
+        if engine is None:
+            return self._send_json(400, {"error": f"Unknown domain {domain!r}",
+                                         "domains": sorted(self.server.engines)})
+
+        try:
+            if domain in self.server.batchers:
+                future = self.server.batchers[domain].submit(payload["text"])
+            else:
+                future = self.server.jobs.submit(lambda: engine.verify_answer(payload["text"]))
+        except queue.Full:
+            return self._send_json(503, {"error": "Server busy, retry shortly"}, {"Retry-After": "1"})
+        try:
+            result = future.result(timeout=self.server.request_timeout)
+        except TimeoutError:
+            future.cancel()
+            return self._send_json(504, {"error": "Verification timed out"})
+        except Exception as error:
+            return self._send_json(500, {"error": f"Verification failed: {error}"})
+
+        self._send_json(200, result.to_dict())
+
+    def do_GET(self) -> None:
+        if self.path != "/api/health":
+            return self._send_json(404, {"error": f"Unknown endpoint {self.path}"})
+        queued = len(self.server.jobs) + sum(len(batcher) for batcher in self.server.batchers.values())
+        self._send_json(200, {"status": "ok", "domains": sorted(self.server.engines), "queued": queued})
+
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        # Per-request stderr logging would dominate at hundreds of requests per second
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ProofSenseServer(ThreadingHTTPServer):
+    """HTTP server with pre-warmed per-domain engines and a bounded verification queue
+
+    ``batch_window`` > 0 micro-batches requests per domain (``queue_size``
+    then bounds each domain's pending requests, ``max_batch_claims`` the
+    claims per retrieval pass); 0 uses ``workers`` threads. All default to
+    API_CONFIG.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 8000), workers: int = 8, queue_size: int = 256,
+                 domains: Optional[Sequence[str]] = None, engine_options: Optional[Dict] = None,
+                 request_timeout: Optional[float] = None, verbose: bool = False,
+                 batch_window: Optional[float] = None, max_batch: Optional[int] = None,
+                 max_batch_claims: Optional[int] = None):
+        # Engines (and their indexes) are built before the socket accepts anything
+        self.engines: Dict[str, ProofSenseEngine] = {
+            domain: get_engine(domain, **(engine_options or {})) for domain in (domains or DOMAIN_CONFIG)
+        }
+        batch_window = API_CONFIG["batch_window"] if batch_window is None else batch_window
+        max_batch = API_CONFIG["max_batch"] if max_batch is None else max_batch
+        max_batch_claims = API_CONFIG["max_batch_claims"] if max_batch_claims is None else max_batch_claims
+        self.batchers: Dict[str, MicroBatcher] = {
+            domain: MicroBatcher(engine, batch_window, max_batch, queue_size, max_batch_claims)
+            for domain, engine in self.engines.items()
+        } if batch_window > 0 else {}
+        self.jobs = VerificationQueue(0 if self.batchers else workers, queue_size)
+        self.request_timeout = ADVANCED["max_processing_time"] if request_timeout is None else request_timeout
+        self.verbose = verbose
+        super().__init__(address, VerifyRequestHandler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.jobs.close()
+        for batcher in self.batchers.values():
+            batcher.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve POST /api/verify over HTTP")
+    parser.add_argument("--host", default=API_CONFIG["host"])
+    parser.add_argument("--port", type=int, default=API_CONFIG["port"])
+    parser.add_argument("--workers", type=int, default=API_CONFIG["workers"], help="Verification threads")
+    parser.add_argument("--queue-size", type=int, default=API_CONFIG["queue_size"],
+                        help="Requests waiting for a worker before answering 503")
+    parser.add_argument("--batch-window", type=float, default=API_CONFIG["batch_window"],
+                        help="Seconds to collect requests into one batch (0 disables batching)")
+    parser.add_argument("--max-batch", type=int, default=API_CONFIG["max_batch"])
+    parser.add_argument("--max-batch-claims", type=int, default=API_CONFIG["max_batch_claims"],
+                        help="Most claims in one batched retrieval pass")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    print("🔌 ProofSense AI - HTTP Service\n")
+    server = ProofSenseServer((args.host, args.port), args.workers, args.queue_size, verbose=args.verbose,
+                              batch_window=args.batch_window, max_batch=args.max_batch,
+                              max_batch_claims=args.max_batch_claims)
+    print(f"Engines ready for: {', '.join(server.engines)}")
+    print(f"Listening on http://{args.host}:{args.port}{API_CONFIG['endpoint']}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
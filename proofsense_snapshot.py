@@ -0,0 +1,81 @@
+"""
+ProofSense AI - Engine Snapshots
+Persist built engine structures so new processes warm-start instead of re-indexing
+
+A snapshot is an evidence store file (see proofsense_store) holding the
+evidence texts, the token index and any retrieval backend arrays (LSH
+signatures, dense vectors). Its file name and header carry a content hash
+of the knowledge base plus everything that shapes the built structures, so
+a changed knowledge base, tokenizer or backend configuration simply misses
+and is rebuilt.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, Optional, Sequence
+import numpy as np
+
+from proofsense_index import EvidenceIndex, STOP_WORDS
+from proofsense_store import STORE_VERSION, EvidenceStore, open_evidence_store, write_evidence_store
+
+SNAPSHOT_VERSION = 2
+
+
+def knowledge_base_hash(texts: Sequence[str], config: Optional[Dict] = None) -> str:
+    """SHA-256 over the evidence texts, the tokenizer and the build configuration"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps({
+        "snapshot_version": SNAPSHOT_VERSION,
+        "store_version": STORE_VERSION,
+        "stop_words": sorted(STOP_WORDS),
+        "config": config or {},
+    }, sort_keys=True, default=repr).encode("utf-8"))
+
+    # Length-prefixed, so ["ab", "c"] and ["a", "bc"] hash differently
+    for text in texts:
+        encoded = text.encode("utf-8")
+        digest.update(len(encoded).to_bytes(8, "little"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+def snapshot_path(snapshot_dir: str, domain: str, content_hash: str) -> str:
+    """Snapshot file for a domain at a given content hash"""
+    return os.path.join(snapshot_dir, f"{domain}-{content_hash[:16]}.pse")
+
+
+def load_snapshot(path: str, content_hash: str) -> Optional[EvidenceStore]:
+    """Open a snapshot if it exists and matches the hash, otherwise None"""
+    if not os.path.exists(path):
+        return None
+    try:
+        store = open_evidence_store(path)
+    except ValueError:
+        # Unreadable or written by another store version: rebuild
+        return None
+    if store.metadata.get("content_hash") != content_hash:
+        return None
+    return store
+
+
+def save_snapshot(path: str, content_hash: str, texts: Sequence[str], index: EvidenceIndex,
+                  backend_arrays: Optional[Dict[str, np.ndarray]] = None) -> None:
+    """Write a snapshot atomically, so concurrent workers never read a partial file"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        os.chmod(tmp_path, 0o644)
+        write_evidence_store(
+            tmp_path, texts, index,
+            metadata={"content_hash": content_hash, "snapshot_version": SNAPSHOT_VERSION},
+            extra_sections=backend_arrays,
+        )
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
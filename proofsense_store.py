@@ -0,0 +1,289 @@
+"""
+ProofSense AI - Evidence Store
+Compact, memory-mapped on-disk format for large knowledge bases
+
+File layout (all sections 64-byte aligned, little-endian):
+
+    magic     8 bytes   b"PSEVID01"
+    length    uint64    size of the JSON header in bytes
+    header    JSON      version, counts and {name: dtype/offset/count} per section
+    sections  raw arrays, offsets relative to the first section
+
+Sections: the evidence texts and the sorted vocabulary (each a UTF-8 blob
+plus int64 offsets), the CSR token-id rows of every evidence sentence and
+the posting lists, plus optional per-sentence source ids. Any further named
+arrays (e.g. LSH signatures or dense vectors in engine snapshots) are stored
+after them with their own dtype and shape. Opening a store maps the file read-only, so load time is
+independent of its size and worker processes share the same page cache.
+"""
+
+import bisect
+import hashlib
+import json
+from collections.abc import Sequence
+from typing import Dict, Tuple, Iterable, Iterator, Optional
+import numpy as np
+
+from proofsense_index import STOP_WORDS, EvidenceIndex, tokenize
+
+STORE_MAGIC = b"PSEVID01"
+STORE_VERSION = 1
+ALIGNMENT = 64
+
+# Section name -> dtype, in file order
+SECTIONS = {
+    "text_blob": np.uint8,
+    "text_offsets": np.int64,
+    "vocab_blob": np.uint8,
+    "vocab_offsets": np.int64,
+    "indptr": np.int64,
+    "indices": np.int32,
+    "lengths": np.int32,
+    "postings": np.int32,
+    "postings_indptr": np.int64,
+    "document_frequency": np.int32,
+}
+
+# Sections that may be absent from a store
+OPTIONAL_SECTIONS = {
+    "source_blob": np.uint8,
+    "source_offsets": np.int64,
+}
+
+# Arrays are written in slices of this many elements to bound the copy buffer
+WRITE_CHUNK = 1 << 20
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def encode_strings(strings: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack strings into a UTF-8 blob plus n + 1 offsets"""
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(data) for data in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+class ContentHasher:
+    """Streaming SHA-256 of evidence texts, recorded as ``content_hash`` in store metadata
+
+    Text lengths and text bytes are digested as two separate streams, so
+    chunks can be fed as whole blobs and the hash does not depend on how the
+    texts were split into chunks.
+    """
+
+    def __init__(self):
+        self._lengths = hashlib.sha256()
+        self._texts = hashlib.sha256()
+
+    def update(self, blob, lengths) -> None:
+        """Add the texts of one chunk: their concatenated UTF-8 bytes and byte lengths"""
+        self._lengths.update(np.asarray(lengths, dtype="<i8").tobytes())
+        self._texts.update(np.asarray(blob, dtype=np.uint8).tobytes())
+
+    def hexdigest(self) -> str:
+        digest = hashlib.sha256(json.dumps({
+            "store_version": STORE_VERSION,
+            "stop_words": sorted(STOP_WORDS),
+        }, sort_keys=True).encode("utf-8"))
+        digest.update(self._lengths.digest())
+        digest.update(self._texts.digest())
+        return digest.hexdigest()
+
+
+def store_content_hash(texts: "MappedStrings") -> str:
+    """Content hash of a store's texts, for stores written without one"""
+    hasher = ContentHasher()
+    for start in range(0, len(texts), WRITE_CHUNK):
+        stop = min(start + WRITE_CHUNK, len(texts))
+        offsets = texts.offsets[start:stop + 1]
+        hasher.update(texts.blob[offsets[0]:offsets[-1]], np.diff(offsets))
+    return hasher.hexdigest()
+
+
+class MappedStrings(Sequence):
+    """Read-only sequence of strings decoded on access from a blob + offsets"""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("string index out of range")
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self[i]
+
+
+class MappedVocabulary:
+    """Sorted word list used as a word -> token id mapping via binary search"""
+
+    def __init__(self, words: MappedStrings):
+        self.words = words
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return self.get(word) is not None
+
+    def get(self, word: str, default: Optional[int] = None) -> Optional[int]:
+        position = bisect.bisect_left(self.words, word)
+        if position < len(self.words) and self.words[position] == word:
+            return position
+        return default
+
+
+class EvidenceStore:
+    """An opened evidence store: the evidence texts plus its ready-to-query index"""
+
+    def __init__(self, texts: Sequence[str], index: EvidenceIndex, metadata: Optional[Dict] = None,
+                 source_ids: Optional[Sequence[str]] = None, extra_sections: Optional[Dict[str, np.ndarray]] = None):
+        self.texts = texts
+        self.index = index
+        self.metadata = metadata or {}
+        self.source_ids = source_ids
+        self.extra_sections = extra_sections or {}
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+
+def write_evidence_store(path: str, texts: Sequence[str], index: Optional[EvidenceIndex] = None,
+                         metadata: Optional[Dict] = None, source_ids: Optional[Sequence[str]] = None,
+                         extra_sections: Optional[Dict[str, np.ndarray]] = None) -> None:
+    """Serialize evidence texts, their index and any extra arrays into the store format
+
+    ``content_hash`` is added to the metadata unless the caller supplies one.
+    """
+    if index is None:
+        index = EvidenceIndex.from_tokens([tokenize(text) for text in texts])
+
+    words = list(index.words())
+    if any(a >= b for a, b in zip(words, words[1:])):
+        raise ValueError("Evidence store vocabulary must be sorted by token id")
+
+    text_blob, text_offsets = encode_strings(texts)
+    vocab_blob, vocab_offsets = encode_strings(words)
+    arrays = {
+        "text_blob": text_blob,
+        "text_offsets": text_offsets,
+        "vocab_blob": vocab_blob,
+        "vocab_offsets": vocab_offsets,
+        "indptr": index.indptr,
+        "indices": index.indices,
+        "lengths": index.lengths,
+        "postings": index.postings,
+        "postings_indptr": index.postings_indptr,
+        "document_frequency": index.document_frequency,
+    }
+    if source_ids is not None:
+        arrays["source_blob"], arrays["source_offsets"] = encode_strings(source_ids)
+    for name, array in (extra_sections or {}).items():
+        if name in SECTIONS or name in OPTIONAL_SECTIONS:
+            raise ValueError(f"Extra section '{name}' clashes with a built-in section")
+        arrays[name] = array
+
+    if "content_hash" not in (metadata or {}):
+        hasher = ContentHasher()
+        hasher.update(text_blob, np.diff(text_offsets))
+        metadata = {**(metadata or {}), "content_hash": hasher.hexdigest()}
+
+    write_store_sections(path, arrays, metadata)
+
+
+def write_store_sections(path: str, arrays: Dict[str, np.ndarray], metadata: Optional[Dict] = None) -> None:
+    """Write prepared section arrays (in memory or memory-mapped) as a store file
+
+    Built-in sections are cast to their fixed dtype; any other array keeps
+    its own dtype and shape.
+    """
+    names = list(SECTIONS) + [name for name in OPTIONAL_SECTIONS if name in arrays]
+    names += [name for name in arrays if name not in SECTIONS and name not in OPTIONAL_SECTIONS]
+    dtypes = {**SECTIONS, **OPTIONAL_SECTIONS}
+    dtypes.update({name: arrays[name].dtype for name in names if name not in dtypes})
+
+    layout = {}
+    offset = 0
+    for name in names:
+        dtype = np.dtype(dtypes[name])
+        count = int(np.prod(np.shape(arrays[name])))
+        layout[name] = {"dtype": dtype.str, "offset": offset, "count": count}
+        if np.ndim(arrays[name]) > 1:
+            layout[name]["shape"] = list(np.shape(arrays[name]))
+        offset = _align(offset + count * dtype.itemsize)
+
+    header = json.dumps({
+        "version": STORE_VERSION,
+        "num_evidence": len(arrays["text_offsets"]) - 1,
+        "vocabulary_size": len(arrays["vocab_offsets"]) - 1,
+        "metadata": metadata or {},
+        "sections": layout,
+    }).encode("utf-8")
+    data_start = _align(len(STORE_MAGIC) + 8 + len(header))
+
+    with open(path, "wb") as f:
+        f.write(STORE_MAGIC)
+        f.write(np.uint64(len(header)).tobytes())
+        f.write(header)
+        for name in names:
+            f.seek(data_start + layout[name]["offset"])
+            array = arrays[name]
+            if np.ndim(array) > 1:
+                array = np.ascontiguousarray(array).reshape(-1)
+            for start in range(0, len(array), WRITE_CHUNK):
+                f.write(np.ascontiguousarray(array[start:start + WRITE_CHUNK], dtype=dtypes[name]).tobytes())
+        f.truncate(data_start + offset)
+
+
+def open_evidence_store(path: str) -> EvidenceStore:
+    """Memory-map an evidence store; nothing is copied or parsed per sentence"""
+    buffer = np.memmap(path, dtype=np.uint8, mode="r")
+
+    if buffer[:len(STORE_MAGIC)].tobytes() != STORE_MAGIC:
+        raise ValueError(f"{path} is not a ProofSense evidence store")
+    header_length = int(buffer[8:16].view(np.uint64)[0])
+    header = json.loads(buffer[16:16 + header_length].tobytes().decode("utf-8"))
+    if header["version"] != STORE_VERSION:
+        raise ValueError(f"Unsupported evidence store version {header['version']} (expected {STORE_VERSION})")
+
+    data_start = _align(16 + header_length)
+    sections = {}
+    for name, section in header["sections"].items():
+        dtype = np.dtype(section["dtype"])
+        start = data_start + section["offset"]
+        sections[name] = buffer[start:start + section["count"] * dtype.itemsize].view(dtype)
+        if "shape" in section:
+            sections[name] = sections[name].reshape(section["shape"])
+
+    vocabulary = MappedVocabulary(MappedStrings(sections["vocab_blob"], sections["vocab_offsets"]))
+    index = EvidenceIndex(
+        vocabulary,
+        sections["indptr"],
+        sections["indices"],
+        sections["lengths"],
+        sections["postings"],
+        sections["postings_indptr"],
+        sections["document_frequency"],
+    )
+    texts = MappedStrings(sections["text_blob"], sections["text_offsets"])
+    source_ids = None
+    if "source_offsets" in sections:
+        source_ids = MappedStrings(sections["source_blob"], sections["source_offsets"])
+    extra_sections = {
+        name: array for name, array in sections.items() if name not in SECTIONS and name not in OPTIONAL_SECTIONS
+    }
+    return EvidenceStore(texts, index, header.get("metadata"), source_ids, extra_sections)
@@ -4,9 +4,15 @@ ProofSense AI Demo Script
 Run automated tests to verify all features work correctly
 """
 
+import json
+import os
 import sys
+import tempfile
 import time
 from proofsense_app import ProofSenseEngine, VerificationResult
+import proofsense_core
+from proofsense_store import write_evidence_store, open_evidence_store, store_content_hash
+from proofsense_ingest import ingest_evidence
 
 def print_header(text):
     """Print formatted header"""
@@ -257,6 +263,867 @@ def run_performance_test():
     print("\n✅ Test 9 PASSED: Performance acceptable")
     return True
 
+def test_batched_retrieval():
+    """Test 10: Batched Retrieval"""
+    print_header("TEST 10: Batched Retrieval")
+    
+    engine = proofsense_core.ProofSenseEngine("general")
+    
+    claims = [
+        "The Earth orbits the Sun",
+        "Photosynthesis converts sunlight to energy",
+        "Purple elephants dance on Mars",
+        "the a an",
+    ]
+    
+    batched = engine.retrieve_evidence_batch(claims, top_k=3)
+    
+    for claim, evidence in zip(claims, batched):
+        print(f"Claim: {claim} -> {len(evidence)} sources")
+        assert evidence == engine.retrieve_evidence(claim, top_k=3), "Batch should match single-claim retrieval"
+    
+    assert engine.retrieve_evidence_batch([]) == [], "Empty batch should return no results"
+    
+    print("\n✅ Test 10 PASSED: Batched retrieval matches single-claim retrieval")
+    return True
+
+def test_lsh_retrieval():
+    """Test 11: Approximate (MinHash LSH) Retrieval"""
+    print_header("TEST 11: Approximate (MinHash LSH) Retrieval")
+    
+    exact_engine = proofsense_core.ProofSenseEngine("general")
+    lsh_engine = proofsense_core.ProofSenseEngine("general", retrieval="lsh")
+    
+    for evidence in proofsense_core.KNOWLEDGE_BASE["general"]:
+        exact = exact_engine.retrieve_evidence(evidence)
+        approximate = lsh_engine.retrieve_evidence(evidence)
+        
+        # Candidates are re-ranked exactly, so every LSH hit carries its exact score
+        assert set(approximate) <= set(exact), "LSH results should be a subset of exact results"
+        assert approximate and approximate[0] == exact[0], "Identical text should always be found"
+    
+    print(f"Signatures: {lsh_engine.lsh.signatures.shape}, bands: {lsh_engine.lsh.bands}")
+    
+    print("\n✅ Test 11 PASSED: LSH retrieval finds exact matches")
+    return True
+
+def test_mapped_evidence_store():
+    """Test 12: Memory-Mapped Evidence Store"""
+    print_header("TEST 12: Memory-Mapped Evidence Store")
+    
+    knowledge_base = proofsense_core.KNOWLEDGE_BASE["finance"]
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "finance.pse")
+        write_evidence_store(path, knowledge_base, metadata={"domain": "finance"})
+        store = open_evidence_store(path)
+        print(f"Store size: {os.path.getsize(path)} bytes, {len(store)} evidence sentences")
+        
+        assert list(store.texts) == knowledge_base, "Texts should round-trip unchanged"
+        assert store.metadata["domain"] == "finance", "Metadata should round-trip unchanged"
+        assert store.metadata["content_hash"] == store_content_hash(store.texts), "Content hash recorded at write time"
+        
+        in_memory = proofsense_core.ProofSenseEngine("finance")
+        mapped = proofsense_core.ProofSenseEngine("finance", evidence_store=store)
+        text = "Compound interest is calculated on principal and accumulated interest. The stock market is guaranteed to provide 30% annual returns."
+        assert mapped.verify_answer(text).to_dict() == in_memory.verify_answer(text).to_dict(), \
+            "Store-backed engine should verify exactly like the in-memory engine"
+        del store, mapped
+    
+    print("\n✅ Test 12 PASSED: Evidence store round-trips through mmap")
+    return True
+
+def test_streaming_ingestion():
+    """Test 13: Streaming Evidence Ingestion"""
+    print_header("TEST 13: Streaming Evidence Ingestion")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "evidence.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for domain in ["general", "health"]:
+                for i, text in enumerate(proofsense_core.KNOWLEDGE_BASE[domain]):
+                    f.write(json.dumps({"text": text, "domain": domain, "source_id": f"{domain}-{i}"}) + "\n")
+        
+        # Small chunks exercise the incremental path; a second run extends the stores
+        output_dir = os.path.join(tmp_dir, "stores")
+        report = ingest_evidence([path], output_dir, chunk_size=4)
+        print(f"Ingested {report.records} records ({report.records_per_second:.0f} records/sec)")
+        assert report.domains == {"general": 10, "health": 10}, "Records should be routed by domain"
+        
+        # Re-ingesting the same feed skips known source ids; new ids extend the store
+        more = os.path.join(tmp_dir, "more.jsonl")
+        with open(more, "w", encoding="utf-8") as f:
+            for i, text in enumerate(proofsense_core.KNOWLEDGE_BASE["general"]):
+                f.write(json.dumps({"text": text, "source_id": f"mirror-{i}"}) + "\n")
+        report = ingest_evidence([path, more], output_dir, chunk_size=4)
+        assert report.duplicates == 20 and report.records == 10, "Known source ids should be skipped"
+        store = open_evidence_store(os.path.join(output_dir, "general.pse"))
+        assert len(store) == 20, "Second run should extend the existing store"
+        assert store.source_ids[11] == "mirror-1", "Source ids should be kept per sentence"
+        
+        # Hashed while spilling: matches a store written in one go, whatever the chunking
+        assert store.metadata["content_hash"] == store_content_hash(store.texts), "Ingest should record the content hash"
+        with tempfile.TemporaryDirectory() as other_dir:
+            write_evidence_store(os.path.join(other_dir, "general.pse"), list(store.texts))
+            assert open_evidence_store(os.path.join(other_dir, "general.pse")).metadata["content_hash"] == \
+                store.metadata["content_hash"], "Content hash should not depend on how texts were written"
+        
+        engine = proofsense_core.ProofSenseEngine("general", evidence_store=store)
+        assert engine.kb_version == store.metadata["content_hash"], "Cache namespace should come from the store header"
+        evidence = engine.retrieve_evidence("The Earth orbits around the Sun in approximately 365.25 days.")
+        assert evidence and evidence[0][1] == 1.0, "Ingested evidence should be retrievable"
+        del store, engine
+        
+        # A malformed record fails the run, naming its line, without leaking scratch files
+        broken = os.path.join(tmp_dir, "broken.jsonl")
+        before = sorted(os.listdir(output_dir))
+        for bad_line in ['{not json', '[1, 2]', '{"text": 5}', '{"text": "Extra evidence.", "domain": ["general"]}']:
+            with open(broken, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"text": "Extra evidence.", "source_id": "extra"}) + "\n" + bad_line + "\n")
+            try:
+                ingest_evidence([broken], output_dir, chunk_size=4)
+                assert False, f"Malformed record should raise: {bad_line}"
+            except ValueError as error:
+                assert str(error).startswith(f"{broken}:2:"), str(error)
+            assert sorted(os.listdir(output_dir)) == before, "Spill dirs and .tmp files should be removed"
+        assert len(open_evidence_store(os.path.join(output_dir, "general.pse"))) == 20
+        
+        # Falsy but present source ids are kept
+        with open(broken, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"text": "Zero is a number.", "source_id": 0}) + "\n")
+        ingest_evidence([broken], os.path.join(tmp_dir, "zero"))
+        assert open_evidence_store(os.path.join(tmp_dir, "zero", "general.pse")).source_ids[0] == "0"
+    
+    print("\n✅ Test 13 PASSED: Streaming ingestion builds and extends stores")
+    return True
+
+def test_alternative_scorers():
+    """Test 14: BM25 / TF-IDF Scoring"""
+    print_header("TEST 14: BM25 / TF-IDF Scoring")
+    
+    text = "The Earth orbits the Sun in 365 days. Purple elephants dance on Mars."
+    
+    for scorer in ["bm25", "tfidf"]:
+        engine = proofsense_core.ProofSenseEngine("general", scorer=scorer)
+        result = engine.verify_answer(text)
+        print(f"{scorer}: overall {result.overall_score:.1f}/100, claims {[round(c.confidence_score, 1) for c in result.claims]}")
+        
+        assert result.claims[0].evidence[0].startswith("The Earth orbits"), f"{scorer} should rank the matching evidence first"
+        assert result.claims[1].risk_level == "high", f"{scorer} should flag unsupported claims"
+        
+        for evidence in proofsense_core.KNOWLEDGE_BASE["general"]:
+            best, score = engine.retrieve_evidence(evidence, top_k=1)[0]
+            assert best == evidence and 0 < score <= 1.0 + 1e-9, f"{scorer} scores should be normalized to [0, 1]"
+    
+    print("\n✅ Test 14 PASSED: Alternative scorers working")
+    return True
+
+def test_dense_retrieval():
+    """Test 15: Hashed Dense Retrieval"""
+    print_header("TEST 15: Hashed Dense Retrieval")
+    
+    claims = [
+        "The Earth orbits the Sun in approximately 365 days.",
+        "Photosynthesis converts sunlight into energy in plants.",
+        "Purple elephants dance on Mars.",
+    ]
+    exact = proofsense_core.ProofSenseEngine("general")
+    
+    for options in [{}, {"quantize": True}]:
+        engine = proofsense_core.ProofSenseEngine("general", retrieval="dense", retrieval_options=options)
+        print(f"dense {options}: matrix {engine.dense.vectors.shape} {engine.dense.vectors.dtype}")
+        assert engine.retrieve_evidence_batch(claims) == exact.retrieve_evidence_batch(claims), \
+            "Re-ranked dense shortlists should match exact retrieval"
+    
+    raw = proofsense_core.ProofSenseEngine("general", retrieval="dense", retrieval_options={"rerank": False})
+    for evidence in proofsense_core.KNOWLEDGE_BASE["general"]:
+        best, score = raw.retrieve_evidence(evidence, top_k=1)[0]
+        assert best == evidence and score <= 1.0, "Evidence should be its own nearest vector"
+    unrelated = raw.retrieve_evidence("Purple elephants dance on Mars.")
+    assert all(score < 0.3 for _, score in unrelated), "Unrelated claims should only find weak matches"
+    
+    # Duplicated evidence ties exactly, so each chunk's k-th best score is shared by several rows
+    import numpy as np
+    from proofsense_dense import FEATURE_CACHE_SIZE, HashedDenseIndex, _word_features
+    texts = proofsense_core.KNOWLEDGE_BASE["general"] * 6
+    dense = HashedDenseIndex(texts, rerank=False, chunk_size=32)
+    queries = proofsense_core.KNOWLEDGE_BASE["general"]
+    encoded = dense.encode(queries)
+    # Scored chunk by chunk, like search_batch, so float rounding matches too
+    full = np.concatenate([encoded @ dense.vectors[i:i + 32].T for i in range(0, len(texts), 32)], axis=1)
+    for top_k in (1, 3, 5, 8):
+        expected = [np.lexsort((np.arange(len(row)), -row))[:top_k].tolist() for row in np.minimum(full, 1.0)]
+        assert [[i for i, _ in hits] for hits in dense.search_batch(queries, top_k)] == expected, \
+            "Ties should be broken by evidence id"
+    assert _word_features.cache_info().maxsize == FEATURE_CACHE_SIZE, "Word feature cache should be bounded"
+    
+    print("\n✅ Test 15 PASSED: Dense retrieval working")
+    return True
+
+def test_engine_registry():
+    """Test 16: Shared Engine Registry"""
+    print_header("TEST 16: Shared Engine Registry")
+    
+    proofsense_core.invalidate_engines()
+    
+    start = time.time()
+    engine = proofsense_core.get_engine("finance")
+    build_time = time.time() - start
+    
+    start = time.time()
+    again = proofsense_core.get_engine("finance")
+    lookup_time = time.time() - start
+    print(f"First build: {build_time*1000:.2f}ms, cached lookup: {lookup_time*1000:.3f}ms")
+    
+    assert again is engine, "Same domain should reuse the warmed engine"
+    assert proofsense_core.get_engine("finance", scorer="bm25") is not engine, "Different options need their own engine"
+    assert proofsense_core.get_engine("health") is not engine, "Different domains need their own engine"
+    
+    assert proofsense_core.invalidate_engines("finance") == 2, "Invalidation should drop every finance engine"
+    assert proofsense_core.get_engine("finance") is not engine, "Invalidated engines should be rebuilt"
+    assert proofsense_core.get_engine("health") is proofsense_core.get_engine("health"), "Other domains stay cached"
+    
+    proofsense_core.invalidate_engines()
+    
+    print("\n✅ Test 16 PASSED: Engine registry working")
+    return True
+
+def test_snapshot_warm_start():
+    """Test 17: Snapshot Warm Start"""
+    print_header("TEST 17: Snapshot Warm Start")
+    
+    import numpy as np
+    
+    claims = ["The Earth orbits the Sun in 365 days.", "Water boils at 100 degrees Celsius."]
+    
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        for retrieval in ["exact", "lsh", "dense"]:
+            cold = proofsense_core.ProofSenseEngine("general", retrieval=retrieval, snapshot_dir=snapshot_dir)
+            warm = proofsense_core.ProofSenseEngine("general", retrieval=retrieval, snapshot_dir=snapshot_dir)
+            
+            assert warm.retrieve_evidence_batch(claims) == cold.retrieve_evidence_batch(claims), \
+                f"{retrieval}: warm-started engine should retrieve exactly like a fresh build"
+            assert isinstance(cold.index.vocabulary, dict) and not isinstance(warm.index.vocabulary, dict), \
+                f"{retrieval}: warm start should load the index from the snapshot"
+        
+        assert len(os.listdir(snapshot_dir)) == 3, "Each backend configuration gets its own snapshot"
+        
+        # Keys use resolved build parameters: explicit defaults hit, other banding misses
+        defaults = proofsense_core.MinHashLSH.build_config()
+        proofsense_core.ProofSenseEngine("general", retrieval="lsh", retrieval_options=defaults, snapshot_dir=snapshot_dir)
+        assert len(os.listdir(snapshot_dir)) == 3, "Spelling out the defaults should reuse the snapshot"
+        wide = proofsense_core.ProofSenseEngine("general", retrieval="lsh", snapshot_dir=snapshot_dir,
+                                                retrieval_options={"bands": 32, "rows": 2})
+        assert len(os.listdir(snapshot_dir)) == 4, "Different banding should get its own snapshot"
+        
+        # Arrays shaped for other parameters are rebuilt rather than trusted
+        arrays = wide.lsh.snapshot_arrays()
+        lsh = proofsense_core.MinHashLSH(wide.index, snapshot=arrays)
+        assert not lsh.from_snapshot and lsh.bucket_keys.shape[0] == lsh.bands
+        assert lsh.candidates(proofsense_core.tokenize(claims[0])).size > 0
+        dense = proofsense_core.HashedDenseIndex(wide.knowledge_base, dim=256,
+                                                 snapshot={"dense_vectors": np.zeros((3, 1024), np.float32)})
+        assert not dense.from_snapshot and dense.vectors.shape == (len(wide.knowledge_base), 256)
+        
+        # A changed knowledge base misses the snapshot and writes a new one
+        proofsense_core.KNOWLEDGE_BASE["snapshot_test"] = list(proofsense_core.KNOWLEDGE_BASE["general"])
+        try:
+            proofsense_core.ProofSenseEngine("snapshot_test", snapshot_dir=snapshot_dir)
+            proofsense_core.KNOWLEDGE_BASE["snapshot_test"].append("Mount Everest is the highest mountain above sea level.")
+            engine = proofsense_core.ProofSenseEngine("snapshot_test", snapshot_dir=snapshot_dir)
+            assert engine.retrieve_evidence("Mount Everest is the highest mountain.")[0][0].startswith("Mount Everest"), \
+                "New evidence should be indexed after a content change"
+            assert len([f for f in os.listdir(snapshot_dir) if f.startswith("snapshot_test-")]) == 2
+        finally:
+            del proofsense_core.KNOWLEDGE_BASE["snapshot_test"]
+    
+    print("\n✅ Test 17 PASSED: Snapshot warm start working")
+    return True
+
+def test_streaming_verification():
+    """Test 18: Streaming Verification"""
+    print_header("TEST 18: Streaming Verification")
+    
+    engine = proofsense_core.ProofSenseEngine("general")
+    text = ("The Earth orbits the Sun in 365 days. Photosynthesis is guaranteed to work, and "
+            "the Internet was invented in 1995 by Bill Gates! Water boils at 100 degrees Celsius.")
+    
+    items = list(engine.verify_answer_stream(text, batch_size=2))
+    claims, summary = items[:-1], items[-1]
+    result = engine.verify_answer(text)
+    
+    assert all(isinstance(claim, proofsense_core.Claim) for claim in claims), "Claims should stream first"
+    assert isinstance(summary, proofsense_core.VerificationSummary), "A summary should come last"
+    assert [c.to_dict() for c in claims] == [c.to_dict() for c in result.claims], "Streamed claims should match verify_answer"
+    assert summary.overall_score == result.overall_score and summary.risk_distribution == result.risk_distribution
+    
+    # The first claim arrives before later sentences are even extracted
+    long_text = " ".join(["The Earth orbits the Sun in 365 days."] * 20000)
+    start = time.time()
+    first = next(engine.verify_answer_stream(long_text))
+    first_claim_time = time.time() - start
+    print(f"Time to first claim on a 20000-claim answer: {first_claim_time*1000:.2f}ms")
+    assert first.text == "The Earth orbits the Sun in 365 days."
+    assert first_claim_time < 0.1, "Time to first claim should not depend on answer length"
+    
+    print("\n✅ Test 18 PASSED: Streaming verification working")
+    return True
+
+def test_incremental_verification():
+    """Test 19: Incremental Token-Stream Verification"""
+    print_header("TEST 19: Incremental Token-Stream Verification")
+    
+    engine = proofsense_core.ProofSenseEngine("general")
+    text = ("The Earth orbits the Sun in 365 days.  Photosynthesis is guaranteed to work, and "
+            "the Internet was invented in 1995 by Bill Gates!\nWater boils at 100 degrees Celsius")
+    
+    verifier = proofsense_core.IncrementalVerifier(engine)
+    completed = []
+    for i in range(0, len(text), 3):
+        completed.append(len(verifier.feed(text[i:i + 3])))
+    
+    print(f"Claims completed while streaming: {sum(completed)}")
+    assert sum(completed) == 3, "Every claim before the trailing sentence should be verified during the stream"
+    assert completed.index(1) < len(text) // 3 // 2, "The first claim should be verified as soon as its sentence ends"
+    
+    result = verifier.finish()
+    assert result.to_dict() == engine.verify_answer(text).to_dict(), "Incremental result should match verify_answer"
+    
+    # Trailing whitespace after the last sentence must not change its claims
+    for tail in ("The loan earns compound credit, and \n", "Water boils at 100 degrees Celsius.  ", "   "):
+        verifier = proofsense_core.IncrementalVerifier(engine)
+        for i in range(0, len(text + " " + tail), 4):
+            verifier.feed((text + " " + tail)[i:i + 4])
+        assert verifier.finish().to_dict() == engine.verify_answer(text + " " + tail).to_dict(), repr(tail)
+    
+    print("\n✅ Test 19 PASSED: Incremental verification working")
+    return True
+
+def test_claim_cache():
+    """Test 20: Claim Result Cache"""
+    print_header("TEST 20: Claim Result Cache")
+    
+    from proofsense_cache import ClaimCache
+    
+    now = [0.0]
+    cache = ClaimCache(max_entries=2, ttl=60, clock=lambda: now[0])
+    engine = proofsense_core.ProofSenseEngine("general", cache=cache)
+    other = proofsense_core.ProofSenseEngine("general", cache=cache)
+    uncached = proofsense_core.ProofSenseEngine("general")
+    uncached.cache = None
+    
+    text = "The Earth orbits the Sun in 365 days. The Internet was definitely invented in 1995 by Bill Gates."
+    first = engine.verify_answer(text)
+    second = other.verify_answer(text.upper().replace("THE EARTH", "The Earth"))
+    print(f"Stats after repeat: {cache.stats()}")
+    
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 2, "Engines sharing a cache should reuse claims"
+    assert first.to_dict() == uncached.verify_answer(text).to_dict(), "Cached results should match uncached ones"
+    assert second.claims[1].text.isupper(), "Cached claims keep the caller's wording"
+    
+    engine.verify_answer("Water boils at 100 degrees Celsius at sea level.")
+    assert cache.stats()["evictions"] == 1 and len(cache) == 2, "LRU entries should be evicted past max_entries"
+    
+    now[0] = 120.0
+    engine.verify_answer("Water boils at 100 degrees Celsius at sea level.")
+    assert cache.stats()["expirations"] == 1, "Entries older than the TTL should expire"
+    
+    engine.similarity_threshold = 0.5
+    hits = cache.stats()["hits"]
+    engine.verify_answer("Water boils at 100 degrees Celsius at sea level.")
+    assert cache.stats()["hits"] == hits, "A different scoring configuration must not reuse cached claims"
+    
+    print("\n✅ Test 20 PASSED: Claim cache working")
+    return True
+
+def test_claim_deduplication():
+    """Test 21: Intra-Answer Claim Deduplication"""
+    print_header("TEST 21: Intra-Answer Claim Deduplication")
+    
+    engine = proofsense_core.ProofSenseEngine("general")
+    engine.cache = None
+    
+    retrieved = []
+    retrieve_batch = engine.retrieve_evidence_batch
+    def counting_retrieve(claims, top_k=3):
+        retrieved.extend(claims)
+        return retrieve_batch(claims, top_k)
+    engine.retrieve_evidence_batch = counting_retrieve
+    
+    text = " ".join(["The Earth orbits the Sun.", "Water always boils at 100 degrees.", "the earth orbits the sun."] * 20)
+    result = engine.verify_answer(text)
+    print(f"Claims: {result.total_claims}, retrieved: {len(retrieved)}")
+    
+    assert len(retrieved) == 2, "Each distinct claim should be retrieved once"
+    assert result.total_claims == 60 and sum(result.risk_distribution.values()) == 60, "Every copy should still be counted"
+    assert [c.text for c in result.claims] == engine.extract_claims(text), "Claim order and wording should be unchanged"
+    assert result.claims[0] is not result.claims[3], "Every position gets its own Claim object"
+    
+    print("\n✅ Test 21 PASSED: Claim deduplication working")
+    return True
+
+def test_edit_reverification():
+    """Test 22: Edit-Aware Re-Verification"""
+    print_header("TEST 22: Edit-Aware Re-Verification")
+    
+    engine = proofsense_core.ProofSenseEngine("general")
+    engine.cache = None
+    
+    sentences = ["The Earth orbits the Sun in 365 days.", "Photosynthesis converts sunlight into energy.",
+                 "Water boils at 100 degrees Celsius.", "The human body has 206 bones."]
+    previous = engine.verify_answer(" ".join(sentences))
+    
+    edited = list(sentences)
+    edited[2] = "The Internet was definitely invented in 1995 by Bill Gates."
+    edited.append("Shakespeare wrote approximately 37 plays.")
+    
+    retrieved = []
+    retrieve_batch = engine.retrieve_evidence_batch
+    def counting_retrieve(claims, top_k=3):
+        retrieved.extend(claims)
+        return retrieve_batch(claims, top_k)
+    engine.retrieve_evidence_batch = counting_retrieve
+    
+    result = engine.reverify_answer(previous, " ".join(edited))
+    print(f"Re-verified claims: {retrieved}")
+    
+    assert retrieved == [edited[2], edited[4]], "Only changed and added claims should be re-verified"
+    assert all(result.claims[i] is previous.claims[i] for i in (0, 1, 3)), "Unchanged Claim objects should be reused"
+    
+    engine.retrieve_evidence_batch = retrieve_batch
+    assert result.to_dict() == engine.verify_answer(" ".join(edited)).to_dict(), "Result should match a full re-verification"
+    
+    print("\n✅ Test 22 PASSED: Edit-aware re-verification working")
+    return True
+
+def test_combined_language_matcher():
+    """Test 23: Combined Overconfidence Matcher"""
+    print_header("TEST 23: Combined Overconfidence Matcher")
+    
+    import re
+    from config import OVERCONFIDENT_PATTERNS
+    
+    def per_pattern_warnings(claim):
+        warnings = []
+        for pattern in OVERCONFIDENT_PATTERNS:
+            matches = re.findall(pattern, claim.lower())
+            if matches:
+                warnings.append(f"Overconfident language detected: '{matches[0]}'")
+        return warnings
+    
+    engine = proofsense_core.ProofSenseEngine("finance")
+    text = ("The market will never crash, and returns are guaranteed 100 percent for sure. "
+            "Bonds ALWAYS pay interest without fail! Diversification certainly reduces risk.")
+    spans = list(engine.iter_claim_spans(text))
+    claims = [text[start:end] for start, end in spans]
+    
+    single = [engine.detect_overconfident_language(claim) for claim in claims]
+    for claim, warnings in zip(claims, single):
+        print(f"{claim!r}: {warnings}")
+    
+    assert claims == engine.extract_claims(text), "Claim spans should match extract_claims"
+    assert single == [per_pattern_warnings(claim) for claim in claims], "Warnings should match one findall per pattern"
+    assert engine.detect_overconfident_language_batch(text, spans) == single, "Batch scan should assign matches by offset"
+    assert any("100 percent" in w for w in single[1]), "Configured patterns beyond the original 12 should be used"
+    
+    engine.overconfident_patterns.append(r'\bsurely\b')
+    assert engine.detect_overconfident_language("Surely this works.") == ["Overconfident language detected: 'surely'"]
+    
+    print("\n✅ Test 23 PASSED: Combined matcher working")
+    return True
+
+def test_claim_type_classification():
+    """Test 24: Claim Type Classification"""
+    print_header("TEST 24: Claim Type Classification")
+    
+    engine = proofsense_core.ProofSenseEngine("general")
+    engine.cache = None
+    text = ("Water boils at 100 degrees Celsius. Plants grow because they convert sunlight into energy. "
+            "The capital of France is Paris.")
+    
+    result = engine.verify_answer(text)
+    types = [claim.claim_type for claim in result.claims]
+    print(f"Claim types: {types}")
+    
+    assert types == ["📊 Quantitative", "🧠 Causal", "📚 Factual"], "Each claim should carry its type"
+    assert result.claims[0].to_dict()["claim_type_desc"] == "Contains numerical/measured data"
+    streamed = list(engine.verify_answer_stream(text))[:-1]
+    assert [claim.claim_type for claim in streamed] == types, "Per-claim and batch classification should agree"
+    
+    # The taxonomy is configurable per engine
+    engine.claim_types.insert(0, {"label": "🏛️ Geographic", "description": "Mentions a place",
+                                  "pattern": r'\b(?:france|paris)\b'})
+    assert engine.verify_answer(text).claims[2].claim_type == "🏛️ Geographic"
+    
+    print("\n✅ Test 24 PASSED: Claim type classification working")
+    return True
+
+def test_vectorized_scoring():
+    """Test 25: Vectorized Scoring Kernel"""
+    print_header("TEST 25: Vectorized Scoring Kernel")
+    
+    from proofsense_scoring import score_evidence_lists
+    
+    engine = proofsense_core.ProofSenseEngine("general")
+    evidence_lists = [
+        [("a", 0.9), ("b", 0.8), ("c", 0.7)],
+        [("a", 0.5), ("b", 0.3)],
+        [("a", 0.2)],
+        [],
+    ]
+    batch = engine.score_claims(evidence_lists)
+    single = [engine.calculate_claim_score("claim", evidence) for evidence in evidence_lists]
+    print(f"Batch scores: {[(round(score, 1), risk) for score, risk in batch]}")
+    
+    assert batch == single, "Batch and single-claim scoring should agree"
+    assert [risk for _, risk in batch] == ["verified", "low", "high", "high"]
+    assert batch[3] == (0.0, "high"), "Claims without evidence score zero"
+    
+    # Weights and thresholds come from config and can be changed per call or per engine
+    heavy_best = score_evidence_lists(evidence_lists[:1], weights={"best_match": 1.0, "source_count": 0.0,
+                                                                   "avg_quality": 0.0})
+    assert abs(heavy_best[0][0] - 90.0) < 1e-9
+    engine.risk_thresholds["verified"] = 95
+    assert engine.calculate_claim_score("claim", evidence_lists[0])[1] == "low"
+    
+    # Thousands of claims in one call
+    start = time.time()
+    many = score_evidence_lists(evidence_lists * 2500)
+    print(f"Scored {len(many)} claims in {(time.time() - start)*1000:.1f}ms")
+    assert many[:4] == batch
+    
+    print("\n✅ Test 25 PASSED: Vectorized scoring working")
+    return True
+
+def test_calibration_sweep():
+    """Test 26: Calibration Sweep"""
+    print_header("TEST 26: Calibration Sweep")
+    
+    from config import EVIDENCE_SETTINGS
+    from proofsense_calibration import calibrate, profile_grid
+    
+    answers = [
+        "The Earth orbits around the Sun in approximately 365 days. Water boils at 100 degrees Celsius.",
+        "The Internet was definitely invented in 1995 by Bill Gates. The capital of France is Paris.",
+        "The human body has 206 bones, and Shakespeare wrote approximately 37 plays.",
+    ]
+    profiles = profile_grid(
+        risk_thresholds=[{"verified": v, "low": 50, "medium": 30} for v in (60, 70, 80)],
+        similarity_threshold=[0.05, 0.1, 0.2],
+    )
+    engine = proofsense_core.ProofSenseEngine("general")
+    results = calibrate(engine, answers, profiles)
+    print(f"Evaluated {len(results)} profiles")
+    assert len(results) == 9
+    
+    # Every profile reports what verify_answer would with the same settings
+    for result in results:
+        profiled = proofsense_core.ProofSenseEngine("general", cache=proofsense_core.ClaimCache())
+        profiled.risk_thresholds = dict(result["profile"]["risk_thresholds"])
+        profiled.similarity_threshold = result["profile"]["similarity_threshold"]
+        claims = [claim for answer in answers for claim in profiled.verify_answer(answer).claims]
+        distribution = {"verified": 0, "low": 0, "medium": 0, "high": 0}
+        for claim in claims:
+            distribution[claim.risk_level] += 1
+        assert result["risk_distribution"] == distribution, f"Sweep disagrees for {result['profile']}"
+        assert result["total_claims"] == len(claims)
+    
+    # The default profile reproduces the engine's own settings
+    assert calibrate(engine, answers, [{}])[0]["profile"]["similarity_threshold"] == engine.similarity_threshold
+    assert engine.similarity_threshold == EVIDENCE_SETTINGS["similarity_threshold"], "Threshold comes from config"
+    
+    # Retrieval depth and full source-count credit follow one engine setting
+    wide = proofsense_core.ProofSenseEngine("general", cache=proofsense_core.ClaimCache())
+    wide.top_k = 5
+    claim = "Earth Water DNA Paris bones Shakespeare sunlight"
+    assert len(wide.retrieve_evidence(claim, threshold=0.0)) == 5, "Retrieval should return engine.top_k matches"
+    claims = [c for answer in answers for c in wide.verify_answer(answer).claims]
+    distribution = {"verified": 0, "low": 0, "medium": 0, "high": 0}
+    for c in claims:
+        distribution[c.risk_level] += 1
+    assert calibrate(wide, answers, [{}])[0]["risk_distribution"] == distribution, "Sweep should use engine.top_k"
+    
+    print("\n✅ Test 26 PASSED: Calibration sweep working")
+    return True
+
+def test_batch_verification():
+    """Test 27: Batch Verification Across Processes"""
+    print_header("TEST 27: Batch Verification Across Processes")
+    
+    engine = proofsense_core.ProofSenseEngine("general", cache=proofsense_core.ClaimCache())
+    answers = [
+        "The Earth orbits around the Sun in approximately 365 days.",
+        "The Internet was definitely invented in 1995 by Bill Gates.",
+        "The capital of France is Paris. The human body has 206 bones in adults.",
+    ] * 20
+    expected = [engine.verify_answer(answer).to_dict() for answer in answers]
+    
+    start = time.time()
+    results = engine.verify_batch(answers, workers=2, chunksize=8)
+    print(f"Verified {len(results)} answers with 2 workers in {(time.time() - start)*1000:.1f}ms")
+    assert [result.to_dict() for result in results] == expected, "Pool results should match, in order"
+    
+    # Unordered iteration labels each result with its answer's index
+    unordered = dict(engine.iter_verify_batch(iter(answers), workers=2, chunksize=8))
+    assert sorted(unordered) == list(range(len(answers)))
+    assert all(unordered[i].to_dict() == expected[i] for i in unordered)
+    
+    # A single worker runs in-process
+    assert [r.to_dict() for r in engine.verify_batch(answers[:3], workers=1)] == expected[:3]
+    
+    # Other threads in this process rule out fork; an explicit start method is honoured
+    import threading
+    release = threading.Event()
+    waiter = threading.Thread(target=release.wait)
+    waiter.start()
+    try:
+        assert proofsense_core._batch_start_method(None) != "fork", "A multi-threaded parent must not fork"
+    finally:
+        release.set()
+        waiter.join()
+    assert proofsense_core._batch_start_method("spawn") == "spawn"
+    spawned = engine.verify_batch(answers[:4], workers=2, start_method="spawn")
+    assert [r.to_dict() for r in spawned] == expected[:4], "Spawned workers should verify identically"
+    
+    print("\n✅ Test 27 PASSED: Batch verification working")
+    return True
+
+def test_parallel_claim_retrieval():
+    """Test 28: Parallel Claim Retrieval"""
+    print_header("TEST 28: Parallel Claim Retrieval")
+    
+    sentences = [
+        "The Earth orbits around the Sun in approximately 365 days.",
+        "The Internet was definitely invented in 1995 by Bill Gates.",
+        "The capital of France is Paris.",
+        "Shakespeare wrote approximately 37 plays during his lifetime.",
+    ]
+    # Distinct claims, so deduplication doesn't shrink the batch
+    document = " ".join(f"{sentence[:-1]} ({i})." for i in range(50) for sentence in sentences)
+    
+    serial = proofsense_core.ProofSenseEngine("general", claim_workers=1)
+    serial.cache = None
+    threaded = proofsense_core.ProofSenseEngine("general", claim_workers=4)
+    threaded.cache = None
+    
+    start = time.time()
+    result = threaded.verify_answer(document)
+    print(f"Verified {result.total_claims} claims on 4 threads in {(time.time() - start)*1000:.1f}ms")
+    
+    assert result.total_claims == 200
+    assert result.to_dict() == serial.verify_answer(document).to_dict(), "Threaded output should match, in order"
+    claims = [claim.text for claim in result.claims]
+    assert threaded.retrieve_evidence_batch(claims) == serial.retrieve_evidence_batch(claims)
+    
+    print("\n✅ Test 28 PASSED: Parallel claim retrieval working")
+    return True
+
+def test_async_verification():
+    """Test 29: Async Verification API"""
+    print_header("TEST 29: Async Verification API")
+    
+    import asyncio
+    from proofsense_async import AsyncEvidenceBackend, LocalEvidenceBackend
+    
+    engine = proofsense_core.ProofSenseEngine("general")
+    engine.cache = None
+    answers = [
+        "The Earth orbits around the Sun in approximately 365 days. Water boils at 100 degrees Celsius.",
+        "The Internet was definitely invented in 1995 by Bill Gates.",
+        "The capital of France is Paris. The capital of France is Paris.",
+    ]
+    expected = [engine.verify_answer(answer).to_dict() for answer in answers]
+    
+    assert asyncio.run(engine.averify_answer(answers[0])).to_dict() == expected[0]
+    assert [r.to_dict() for r in asyncio.run(engine.averify_batch(answers))] == expected
+    assert asyncio.run(engine.aretrieve_evidence(answers[1])) == engine.retrieve_evidence(answers[1])
+    
+    # Lookups against a slow backend overlap instead of adding up
+    engine.evidence_backend = LocalEvidenceBackend(engine, latency=0.05)
+    assert isinstance(engine.evidence_backend, AsyncEvidenceBackend)
+    start = time.time()
+    results = asyncio.run(engine.averify_batch(answers * 4))
+    elapsed = time.time() - start
+    lookups = sum(result.total_claims for result in results)
+    print(f"{lookups} lookups of 50ms each finished in {elapsed*1000:.0f}ms")
+    assert elapsed < lookups * 0.05 / 2, "Lookups should run concurrently"
+    assert [r.to_dict() for r in results] == expected * 4
+    
+    print("\n✅ Test 29 PASSED: Async verification working")
+    return True
+
+def test_http_service():
+    """Test 30: HTTP Verification Service"""
+    print_header("TEST 30: HTTP Verification Service")
+    
+    import http.client
+    import threading
+    from proofsense_server import ProofSenseServer
+    
+    server = ProofSenseServer(("127.0.0.1", 0), workers=1, queue_size=1, batch_window=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+    
+    def post(payload):
+        connection.request("POST", "/api/verify", body=json.dumps(payload),
+                           headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    
+    try:
+        text = "Water boils at 100 degrees Celsius. The Internet was definitely invented by Bill Gates."
+        start = time.time()
+        status, body = post({"text": text, "domain": "general"})
+        print(f"POST /api/verify -> {status} in {(time.time() - start)*1000:.1f}ms")
+        assert status == 200
+        expected = json.loads(json.dumps(server.engines["general"].verify_answer(text).to_dict()))
+        assert body == expected, "Response should match VerificationResult.to_dict()"
+        
+        # Bad requests are rejected and the kept-alive connection stays usable
+        assert post({"domain": "general"})[0] == 400
+        assert post({"text": text, "domain": "astrology"})[0] == 400
+        assert post({"text": text, "domain": ["general"]})[0] == 400, "Unhashable domain must not crash the handler"
+        assert post({"text": text, "domain": {"name": "general"}})[0] == 400
+        assert post({"text": text})[0] == 200, "Domain defaults to general"
+        
+        # With the single worker busy and the queue full, requests are shed with 503
+        release = threading.Event()
+        server.jobs.submit(release.wait)
+        time.sleep(0.05)
+        server.jobs.submit(release.wait)
+        status, body = post({"text": text})
+        release.set()
+        print(f"Saturated queue -> {status}: {body['error']}")
+        assert status == 503
+    finally:
+        server.shutdown()
+        server.server_close()
+    
+    print("\n✅ Test 30 PASSED: HTTP service working")
+    return True
+
+def test_micro_batching():
+    """Test 31: Micro-Batching Scheduler"""
+    print_header("TEST 31: Micro-Batching Scheduler")
+    
+    import threading
+    from proofsense_batching import MicroBatcher
+    
+    engine = proofsense_core.ProofSenseEngine("general")
+    engine.cache = None
+    answers = [
+        "The Earth orbits around the Sun in approximately 365 days.",
+        "The Internet was definitely invented in 1995 by Bill Gates. The capital of France is Paris.",
+        "The capital of France is Paris.",
+        "",
+    ] * 10
+    expected = [engine.verify_answer(answer).to_dict() for answer in answers]
+    assert [r.to_dict() for r in engine.verify_answers(answers)] == expected
+    
+    # Passes are bounded by claims: count the claims each retrieval pass sees
+    passes = []
+    verify_claims = engine.verify_claims
+    engine.verify_claims = lambda texts, *rest: passes.append(len(texts)) or verify_claims(texts, *rest)
+    assert [r.to_dict() for r in engine.verify_answers(answers, max_claims=5)] == expected
+    del engine.verify_claims
+    assert max(passes) <= 5 and sum(passes) == sum(len(r["claims"]) for r in expected), passes
+    
+    batcher = MicroBatcher(engine, window=0.02, max_batch=16, max_claims=8)
+    results = [None] * len(answers)
+    
+    def request(i):
+        results[i] = batcher.verify(answers[i]).to_dict()
+    
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(len(answers))]
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+    batcher.close()
+    
+    print(f"{batcher.requests} requests in {batcher.batches} batches, {elapsed*1000:.1f}ms")
+    assert results == expected, "Each caller should get its own result"
+    assert batcher.batches < batcher.requests, "Concurrent requests should be coalesced"
+    
+    print("\n✅ Test 31 PASSED: Micro-batching working")
+    return True
+
+def test_batch_retrieval_memory():
+    """Test 32: Bounded Batch Retrieval Memory"""
+    print_header("TEST 32: Bounded Batch Retrieval Memory")
+    
+    import tracemalloc
+    from proofsense_index import EvidenceIndex, tokenize
+    
+    # One token shared by every sentence: each claim using it expands 40k postings
+    evidence = [frozenset({"common", f"topic{i % 500}", f"detail{i}"}) for i in range(40000)]
+    index = EvidenceIndex.from_tokens(evidence)
+    claims = [tokenize(f"common topic{i % 500} detail{i * 7} extra") for i in range(200)]
+    
+    tracemalloc.start()
+    batch = index.top_k_batch(claims, top_k=3, threshold=0.1)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    # Unbounded, 200 claims x 40k postings would need several hundred MB of temporaries
+    print(f"Peak traced memory: {peak / 2**20:.1f} MB for 8M candidate postings")
+    assert peak < 64 * 2**20, "Batch retrieval should expand postings in bounded passes"
+    assert batch == [index.top_k(words, 3, 0.1) for words in claims], "Batch output should match single-claim search"
+    
+    # The size filter never drops pairs that could pass the threshold
+    rows, cols, scores = index.jaccard_batch(claims[:5], threshold=0.1, max_postings=50000)
+    full_rows, full_cols, full_scores = index.jaccard_batch(claims[:5])
+    passing = full_scores > 0.1
+    assert set(zip(rows[scores > 0.1].tolist(), cols[scores > 0.1].tolist())) == \
+        set(zip(full_rows[passing].tolist(), full_cols[passing].tolist()))
+    
+    print("\n✅ Test 32 PASSED: Batch retrieval memory bounded")
+    return True
+
+def test_pruned_top_k_exactness():
+    """Test 33: Pruned Top-k Matches Brute Force"""
+    print_header("TEST 33: Pruned Top-k Matches Brute Force")
+    
+    import random
+    import proofsense_index
+    from proofsense_index import EvidenceIndex, jaccard_similarity, tokenize
+    
+    # A tiny vocabulary and many duplicate sentences make score ties the norm
+    rng = random.Random(7)
+    vocabulary = [f"w{i}" for i in range(12)]
+    evidence = [" ".join(rng.sample(vocabulary, rng.randint(1, 6))) for _ in range(300)]
+    evidence += evidence[:60]
+    evidence_tokens = [tokenize(text) for text in evidence]
+    index = EvidenceIndex.from_tokens(evidence_tokens)
+    claims = [tokenize(" ".join(rng.sample(vocabulary + ["unknown"], rng.randint(1, 7)))) for _ in range(150)]
+    
+    def brute_force(words, top_k, threshold):
+        scored = [(i, jaccard_similarity(words, tokens)) for i, tokens in enumerate(evidence_tokens)]
+        ranked = sorted([(i, score) for i, score in scored if score > threshold], key=lambda item: (-item[1], item[0]))
+        return ranked[:top_k]
+    
+    checked = 0
+    for top_k in (1, 3, 5, 20):
+        for threshold in (0.0, 0.1, 0.25, 0.5):
+            expected = [brute_force(words, top_k, threshold) for words in claims]
+            assert [index.top_k(words, top_k, threshold) for words in claims] == expected, (top_k, threshold)
+            assert index.top_k_batch(claims, top_k, threshold) == expected, (top_k, threshold)
+            checked += len(claims)
+    
+    # Force every claim through the pruned search inside the batch path too
+    original = proofsense_index.PRUNED_SEARCH_POSTINGS
+    proofsense_index.PRUNED_SEARCH_POSTINGS = 0
+    try:
+        assert index.top_k_batch(claims, 3, 0.1) == [brute_force(words, 3, 0.1) for words in claims]
+    finally:
+        proofsense_index.PRUNED_SEARCH_POSTINGS = original
+    
+    print(f"Checked {checked} tie-heavy queries against brute force")
+    print("\n✅ Test 33 PASSED: Pruned top-k exact, including tie order")
+    return True
+
 def run_all_tests():
     """Run all tests"""
     print("\n" + "🔍 PROOFSENSE AI - AUTOMATED TEST SUITE 🔍".center(70))
@@ -272,6 +1139,30 @@ def run_all_tests():
         test_evidence_retrieval,
         test_scoring_algorithm,
         run_performance_test,
+        test_batched_retrieval,
+        test_lsh_retrieval,
+        test_mapped_evidence_store,
+        test_streaming_ingestion,
+        test_alternative_scorers,
+        test_dense_retrieval,
+        test_engine_registry,
+        test_snapshot_warm_start,
+        test_streaming_verification,
+        test_incremental_verification,
+        test_claim_cache,
+        test_claim_deduplication,
+        test_edit_reverification,
+        test_combined_language_matcher,
+        test_claim_type_classification,
+        test_vectorized_scoring,
+        test_calibration_sweep,
+        test_batch_verification,
+        test_parallel_claim_retrieval,
+        test_async_verification,
+        test_http_service,
+        test_micro_batching,
+        test_batch_retrieval_memory,
+        test_pruned_top_k_exactness,
     ]
     
     passed = 0